@@ -1,7 +1,6 @@
 import pandas as pd
 import time
 import os
-from datetime import datetime
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -18,13 +17,16 @@ class FVGDisplay:
         self.last_processed_bar_time = None
         self.last_historical_mod_time = None
 
+        # Parsed file contents keyed on (st_mtime_ns, st_size) so unchanged
+        # files are not re-read and re-parsed on every poll
+        self._historical_cache = None
+        self._live_price_cache = None
+
     def check_historical_updated(self):
         """Check if HistoricalData.csv has been updated (new hourly bar)"""
         try:
-            if not os.path.exists(self.historical_path):
-                return False
-
-            current_mod_time = os.path.getmtime(self.historical_path)
+            # Single stat call - a missing file raises instead of needing exists()
+            current_mod_time = os.stat(self.historical_path).st_mtime_ns
 
             if self.last_historical_mod_time is None:
                 self.last_historical_mod_time = current_mod_time
@@ -34,16 +36,20 @@ class FVGDisplay:
                 self.last_historical_mod_time = current_mod_time
                 return True
 
+            return False
+        except FileNotFoundError:
             return False
         except Exception as e:
             logger.error(f"Error checking historical file: {e}")
             return False
     
     def read_historical_data(self):
-        """Read historical hourly data for FVG detection"""
+        """Read historical hourly data for FVG detection (cached until the file changes)"""
         try:
-            if not os.path.exists(self.historical_path):
-                return None
+            st = os.stat(self.historical_path)
+            cache_key = (st.st_mtime_ns, st.st_size)
+            if self._historical_cache is not None and self._historical_cache[0] == cache_key:
+                return self._historical_cache[1]
 
             df = pd.read_csv(self.historical_path)
             if df.empty:
@@ -56,17 +62,24 @@ class FVGDisplay:
                 logger.info(f"Auto-detected instrument: {self.instrument}")
 
             df['DateTime'] = pd.to_datetime(df['DateTime'])
-            df = df.sort_values('DateTime').reset_index(drop=True)
+            # Bars are exported in time order - only sort if the file says otherwise
+            if not df['DateTime'].is_monotonic_increasing:
+                df = df.sort_values('DateTime').reset_index(drop=True)
+            self._historical_cache = (cache_key, df)
             return df
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.error(f"Error reading historical data: {e}")
             return None
 
     def read_current_price(self):
-        """Read current price from live feed (last line)"""
+        """Read current price from live feed (last line, cached until the file changes)"""
         try:
-            if not os.path.exists(self.live_feed_path):
-                return None
+            st = os.stat(self.live_feed_path)
+            cache_key = (st.st_mtime_ns, st.st_size)
+            if self._live_price_cache is not None and self._live_price_cache[0] == cache_key:
+                return self._live_price_cache[1]
 
             df = pd.read_csv(self.live_feed_path)
             if df.empty:
@@ -74,7 +87,11 @@ class FVGDisplay:
 
             # Get the last line for current price
             last_row = df.iloc[-1]
-            return float(last_row['Last'])
+            price = float(last_row['Last'])
+            self._live_price_cache = (cache_key, price)
+            return price
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.error(f"Error reading current price: {e}")
             return None
@@ -408,7 +425,7 @@ class FVGDisplay:
 
             # Center line with time, instrument, and price
             lines.append("")
-            time_str = datetime.now().strftime('%H:%M:%S')
+            time_str = time.strftime('%H:%M:%S')
             instrument_display = self.instrument if self.instrument else "UNKNOWN"
             center_line = f" {time_str} | Instrument: {instrument_display} | Current Price: {current_price:.2f}"
             lines.append(center_line)
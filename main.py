@@ -94,6 +94,12 @@ class TradingOrchestrator:
             self.trading_agent = None
             logger.warning("No API key found - trading agent not initialized")
 
+        # Risk limits are fixed for the session - read them once, not per bar
+        risk_config = self.config['risk_management']
+        self.max_daily_trades = risk_config['max_daily_trades']
+        self.max_daily_loss = risk_config['max_daily_loss']
+        self.max_consecutive_losses = risk_config['max_consecutive_losses']
+
         # State tracking
         self.daily_trades = 0
         self.daily_pnl = 0.0
@@ -109,21 +115,17 @@ class TradingOrchestrator:
         Returns:
             Tuple of (can_trade, reason)
         """
-        max_daily_trades = self.config['risk_management']['max_daily_trades']
-        max_daily_loss = self.config['risk_management']['max_daily_loss']
-        max_consecutive_losses = self.config['risk_management']['max_consecutive_losses']
-
         if self.trading_paused:
             return False, "Trading is paused (manual intervention required)"
 
-        if self.daily_trades >= max_daily_trades:
-            return False, f"Daily trade limit reached ({max_daily_trades})"
+        if self.daily_trades >= self.max_daily_trades:
+            return False, f"Daily trade limit reached ({self.max_daily_trades})"
 
-        if abs(self.daily_pnl) >= max_daily_loss and self.daily_pnl < 0:
-            return False, f"Daily loss limit reached ({max_daily_loss} points)"
+        if abs(self.daily_pnl) >= self.max_daily_loss and self.daily_pnl < 0:
+            return False, f"Daily loss limit reached ({self.max_daily_loss} points)"
 
-        if self.consecutive_losses >= max_consecutive_losses:
-            return False, f"Consecutive loss limit reached ({max_consecutive_losses})"
+        if self.consecutive_losses >= self.max_consecutive_losses:
+            return False, f"Consecutive loss limit reached ({self.max_consecutive_losses})"
 
         return True, ""
 
@@ -137,7 +139,6 @@ class TradingOrchestrator:
 
         # Import FairValueGaps display to access its state
         import sys
-        import pandas as pd
         import os
         sys.path.insert(0, str(Path.cwd()))
         from FairValueGaps import FVGDisplay
@@ -157,9 +158,13 @@ class TradingOrchestrator:
 
         try:
             while True:
-                # Reload historical data to check for updates
-                historical_df = pd.read_csv('data/HistoricalData.csv')
-                historical_df['DateTime'] = pd.to_datetime(historical_df['DateTime'])
+                # Reload historical data (only re-parsed when the file changed)
+                historical_df = fvg_display.read_historical_data()
+
+                if historical_df is None:
+                    logger.warning("No historical data available")
+                    time.sleep(5)
+                    continue
 
                 # Get latest bar timestamp
                 current_bar_time = historical_df.iloc[-1]['DateTime']
@@ -331,9 +336,6 @@ class TradingOrchestrator:
                     print(self.trading_agent.format_decision_display(result, current_price))
                     print("\nWaiting for next bar")
 
-                    # Brief pause to show result
-                    time.sleep(2)
-
                 else:
                     # WAITING FOR NEW BAR - Show live updates
                     current_price = fvg_display.read_current_price()
@@ -5,7 +5,7 @@ Tests trading strategy on historical data
 
 import pandas as pd
 import logging
-import json
+from collections import Counter
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
@@ -14,6 +14,7 @@ from .fvg_analyzer import FVGAnalyzer
 from .level_detector import LevelDetector
 from .trading_agent import TradingAgent
 from .memory_manager import MemoryManager
+from .json_io import atomic_write, dumps
 
 logger = logging.getLogger(__name__)
 
@@ -66,9 +67,12 @@ class BacktestEngine:
         """
         logger.info(f"Loading historical data from {self.historical_data_path}")
 
-        df = pd.read_csv(self.historical_data_path)
+        # Map the file instead of buffered reads - multi-year exports are large
+        df = pd.read_csv(self.historical_data_path, memory_map=True)
         df['DateTime'] = pd.to_datetime(df['DateTime'])
-        df = df.sort_values('DateTime').reset_index(drop=True)
+        # Bars are exported in time order - only sort if the file says otherwise
+        if not df['DateTime'].is_monotonic_increasing:
+            df = df.sort_values('DateTime').reset_index(drop=True)
 
         if days:
             # Calculate how many bars = days (assuming 1hr bars, ~24 bars per day)
@@ -448,31 +452,53 @@ class BacktestEngine:
                 'avg_bars_held': 0.0
             }
 
-        wins = sum(1 for t in trades if t['result'] == 'WIN')
-        losses = sum(1 for t in trades if t['result'] == 'LOSS')
-        breakeven = sum(1 for t in trades if t['result'] == 'BREAKEVEN')
+        result_counts = Counter(t['result'] for t in trades)
+        wins = result_counts['WIN']
+        losses = result_counts['LOSS']
+        breakeven = result_counts['BREAKEVEN']
+
+        # P&L total/extremes and bars held in one pass, without intermediate lists
+        total_pnl = 0
+        max_win = max_loss = trades[0]['profit_loss']
+        total_bars = 0
+        for t in trades:
+            pnl = t['profit_loss']
+            total_pnl += pnl
+            if pnl > max_win:
+                max_win = pnl
+            if pnl < max_loss:
+                max_loss = pnl
+            total_bars += t['bars_held']
 
-        pnls = [t['profit_loss'] for t in trades]
-        total_pnl = sum(pnls)
         avg_pnl = total_pnl / len(trades)
+        avg_bars = total_bars / len(trades)
 
-        bars_held = [t['bars_held'] for t in trades]
-        avg_bars = sum(bars_held) / len(trades)
+        # By setup type - bucket every trade in one pass
+        type_totals = {
+            setup_type: {'trades': 0, 'wins': 0, 'losses': 0, 'total_pnl': 0}
+            for setup_type in ['fvg_only', 'level_only']
+        }
+        for t in trades:
+            totals = type_totals.get(t.get('setup_type'))
+            if totals is None:
+                continue
+            totals['trades'] += 1
+            if t['result'] == 'WIN':
+                totals['wins'] += 1
+            elif t['result'] == 'LOSS':
+                totals['losses'] += 1
+            totals['total_pnl'] += t['profit_loss']
 
-        # By setup type
         by_type = {}
-        for setup_type in ['fvg_only', 'level_only']:
-            type_trades = [t for t in trades if t.get('setup_type') == setup_type]
-            if type_trades:
-                type_wins = sum(1 for t in type_trades if t['result'] == 'WIN')
-                type_pnl = sum(t['profit_loss'] for t in type_trades)
+        for setup_type, totals in type_totals.items():
+            if totals['trades']:
                 by_type[setup_type] = {
-                    'trades': len(type_trades),
-                    'wins': type_wins,
-                    'losses': sum(1 for t in type_trades if t['result'] == 'LOSS'),
-                    'win_rate': type_wins / len(type_trades),
-                    'total_pnl': type_pnl,
-                    'avg_pnl': type_pnl / len(type_trades)
+                    'trades': totals['trades'],
+                    'wins': totals['wins'],
+                    'losses': totals['losses'],
+                    'win_rate': totals['wins'] / totals['trades'],
+                    'total_pnl': totals['total_pnl'],
+                    'avg_pnl': totals['total_pnl'] / totals['trades']
                 }
 
         return {
@@ -483,8 +509,8 @@ class BacktestEngine:
             'win_rate': wins / (wins + losses) if (wins + losses) > 0 else 0.0,
             'total_pnl': total_pnl,
             'avg_pnl': avg_pnl,
-            'max_win': max(pnls) if pnls else 0.0,
-            'max_loss': min(pnls) if pnls else 0.0,
+            'max_win': max_win,
+            'max_loss': max_loss,
             'avg_bars_held': avg_bars,
             'by_setup_type': by_type
         }
@@ -499,11 +525,8 @@ class BacktestEngine:
         """
         output_path = Path("data") / output_file
 
-        # Convert datetime objects to strings
-        results_copy = json.loads(json.dumps(results, default=str))
-
-        with open(output_path, 'w') as f:
-            json.dump(results_copy, f, indent=2)
+        # Serialize once, converting datetime objects to strings
+        atomic_write(output_path, dumps(results, indent=2, default=str))
 
         logger.info(f"Results exported to {output_path}")
 
@@ -0,0 +1,210 @@
+"""
+JSON I/O Module
+Crash-safe and background file writes shared by the persistence managers
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Union
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # Optional - falls back to the stdlib encoder/decoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def dumps(data: Any, indent: Optional[int] = None,
+          default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize data to UTF-8 encoded JSON, using orjson when available
+
+    Bytes are returned so files are always written as UTF-8, whatever the
+    platform's default text encoding (cp1252 on Windows).
+
+    Args:
+        data: JSON-serializable object
+        indent: Indentation level (None for compact output)
+        default: Fallback converter for unsupported objects (also applied to
+                 datetimes, matching the stdlib encoder)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if default is not None:
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+        try:
+            return orjson.dumps(data, default=default, option=option)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits - let the stdlib encoder handle it
+
+    return json.dumps(data, indent=indent, default=default).encode('utf-8')
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON text, using orjson when available
+
+    Input orjson rejects but the stdlib accepts (NaN/Infinity written by the
+    stdlib encoder) is retried with json.loads. Raises ValueError
+    (json.JSONDecodeError or UnicodeDecodeError) on malformed input.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def load_file(path: Union[str, Path]) -> Any:
+    """Read and parse a JSON file (gzip-compressed if the name ends in .gz)"""
+    path = Path(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if path.suffix == '.gz':
+        data = gzip.decompress(data)
+    return loads(data)
+
+
+def atomic_write(path: Union[str, Path], content: Union[str, bytes]):
+    """
+    Write content to a temp file and atomically replace the target
+
+    Readers always see either the previous or the new complete file,
+    never a truncated one, even if the process dies mid-write.
+    Paths ending in .gz are written gzip-compressed.
+
+    Args:
+        path: Destination file path
+        content: Bytes to write (text is encoded as UTF-8)
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    if path.suffix == '.gz':
+        content = gzip.compress(content, compresslevel=6)
+
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: Union[str, Path], data: Any, indent: Optional[int] = 2):
+    """
+    Serialize data as JSON and write it atomically
+
+    Args:
+        path: Destination file path
+        data: JSON-serializable object
+        indent: Indentation level (None for compact output)
+    """
+    atomic_write(path, dumps(data, indent=indent))
+
+
+class BackgroundWriter:
+    """
+    Single daemon thread that performs atomic file writes off the caller's thread
+
+    Pending writes are kept per path, so a newer submission replaces one
+    still waiting in the queue and only the latest content is written.
+    """
+
+    def __init__(self):
+        """Initialize Background Writer (thread starts on first submit)"""
+        self._pending: Dict[Path, Union[str, bytes]] = {}
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()  # Serializes disk writes across threads
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, path: Union[str, Path], content: Union[str, bytes]):
+        """
+        Queue content to be written to path, superseding any pending write
+
+        Args:
+            path: Destination file path
+            content: Text or bytes to write
+        """
+        with self._cond:
+            self._pending[Path(path)] = content
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="json-io-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def write_now(self, path: Union[str, Path], content: Union[str, bytes]):
+        """
+        Write content synchronously, dropping any older pending write for path
+
+        Raises whatever atomic_write raises.
+        """
+        path = Path(path)
+        with self._io_lock:
+            with self._cond:
+                self._pending.pop(path, None)
+            atomic_write(path, content)
+
+    def flush(self):
+        """Write everything still pending on the calling thread"""
+        while self._write_next():
+            pass
+
+    def _write_next(self) -> bool:
+        """Write one pending file; returns False when nothing was pending"""
+        with self._io_lock:
+            with self._cond:
+                if not self._pending:
+                    return False
+                path = next(iter(self._pending))
+                content = self._pending.pop(path)
+
+            try:
+                atomic_write(path, content)
+            except Exception as e:
+                logger.error(f"Background write to {path} failed: {e}")
+        return True
+
+    def _run(self):
+        """Writer thread loop"""
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            self._write_next()
+
+
+_background_writer: Optional[BackgroundWriter] = None
+_background_writer_lock = threading.Lock()
+
+
+def get_background_writer() -> BackgroundWriter:
+    """Return the process-wide background writer, creating it on first use"""
+    global _background_writer
+    with _background_writer_lock:
+        if _background_writer is None:
+            _background_writer = BackgroundWriter()
+            # Pending state must reach disk on normal interpreter shutdown
+            atexit.register(_background_writer.flush)
+        return _background_writer
@@ -21,7 +21,7 @@ class LevelDetector:
             level_intervals: List of point intervals for levels (default: [100])
         """
         self.level_intervals = level_intervals or [100]
-        logger.info(f"LevelDetector initialized (intervals={self.level_intervals})")
+        logger.info("LevelDetector initialized (intervals=%s)", self.level_intervals)
 
     def round_to_level(self, price: float, interval: int) -> int:
         """
@@ -49,13 +49,14 @@ class LevelDetector:
         """
         # Calculate nearest level
         nearest_level = self.round_to_level(current_price, interval)
+        offset = current_price - nearest_level
 
         # If price is exactly on level, find levels above/below
-        if current_price == nearest_level:
+        if offset == 0:
             level_above = nearest_level + interval
             level_below = nearest_level - interval
         # If price is below nearest level
-        elif current_price < nearest_level:
+        elif offset < 0:
             level_above = nearest_level
             level_below = nearest_level - interval
         # If price is above nearest level
@@ -68,7 +69,7 @@ class LevelDetector:
             'distance_above': level_above - current_price,
             'level_below': level_below,
             'distance_below': current_price - level_below,
-            'on_level': abs(current_price - nearest_level) < 1.0,  # Within 1 point of level
+            'on_level': -1.0 < offset < 1.0,  # Within 1 point of level
             'nearest_level': nearest_level
         }
 
@@ -85,19 +86,14 @@ class LevelDetector:
             List of levels sorted by proximity
         """
         nearest = self.round_to_level(current_price, interval)
-        levels = []
 
-        # Add levels above
-        for i in range(count):
-            if nearest + (i * interval) >= current_price:
-                levels.append(nearest + (i * interval))
+        # Add levels above - only the nearest level itself can sit below price
+        levels = [nearest + i * interval for i in range(count) if i or nearest >= current_price]
 
         # Add levels below
-        for i in range(1, count + 1):
-            if nearest - (i * interval) <= current_price:
-                levels.append(nearest - (i * interval))
+        levels.extend(nearest - i * interval for i in range(1, count + 1))
 
-        # Sort by distance from current price
+        # Sort by distance from current price (stable, so above-first on ties)
         levels.sort(key=lambda x: abs(x - current_price))
         return levels
 
@@ -136,8 +132,8 @@ class LevelDetector:
             'nearby_levels': nearby_levels
         }
 
-        logger.info(f"Level context analyzed: Price={current_price:.2f}, "
-                   f"Nearby levels={len(nearby_levels)}")
+        logger.info("Level context analyzed: Price=%.2f, Nearby levels=%d",
+                    current_price, len(nearby_levels))
 
         return context
 
@@ -3,31 +3,76 @@ Market Analysis Manager Module
 Manages persistent market analysis state across trading sessions
 """
 
-import json
+import copy
 import logging
-from typing import Dict, Optional, Any
+import threading
+from typing import Dict, Iterator, Mapping, Optional, Any
 from datetime import datetime
 from pathlib import Path
 
+from .json_io import dumps, get_background_writer, load_file
+
 logger = logging.getLogger(__name__)
 
 
+class _ReadOnlyView(Mapping):
+    """Live read-only view over a dict; nested values are wrapped on access"""
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return _read_only(self._data[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"_ReadOnlyView({self._data!r})"
+
+
+def _read_only(value: Any) -> Any:
+    """Wrap dicts as read-only views and lists as tuples, at any depth"""
+    if isinstance(value, dict):
+        return _ReadOnlyView(value)
+    if isinstance(value, list):
+        return tuple(_read_only(item) for item in value)
+    return value
+
+
 class MarketAnalysisManager:
     """Manages persistent market analysis state"""
 
-    def __init__(self, analysis_file: str = "data/market_analysis.json"):
+    def __init__(self, analysis_file: str = "data/market_analysis.json", background_writes: bool = True,
+                 pretty_print: bool = False):
         """
         Initialize Market Analysis Manager
 
         Args:
             analysis_file: Path to market analysis persistence file
+            background_writes: Write analysis updates on the shared writer thread (False = write inline)
+            pretty_print: Write the analysis file indented (compact by default; see dump_pretty)
         """
         self.analysis_file = Path(analysis_file)
         self.analysis_file.parent.mkdir(parents=True, exist_ok=True)
+        self.pretty_print = pretty_print
+
+        # Updates are serialized under the lock and written by the background writer
+        self.background_writes = background_writes
+        self._writer = get_background_writer()
+        self._lock = threading.RLock()
 
         # Initialize or load existing analysis
         self.current_analysis = self._load_analysis()
 
+        # Formatted prompt text, rebuilt only after the analysis state changes
+        self._prompt_cache: Optional[str] = None
+
         logger.info(f"MarketAnalysisManager initialized (file={analysis_file})")
 
     def _get_empty_analysis(self) -> Dict[str, Any]:
@@ -75,10 +120,9 @@ class MarketAnalysisManager:
         """
         if self.analysis_file.exists():
             try:
-                with open(self.analysis_file, 'r') as f:
-                    analysis = json.load(f)
-                    logger.info(f"Loaded existing analysis (last updated: {analysis.get('last_updated')})")
-                    return analysis
+                analysis = load_file(self.analysis_file)
+                logger.info(f"Loaded existing analysis (last updated: {analysis.get('last_updated')})")
+                return analysis
             except Exception as e:
                 logger.warning(f"Failed to load analysis file: {e}. Creating new analysis.")
                 return self._get_empty_analysis()
@@ -86,9 +130,18 @@ class MarketAnalysisManager:
             logger.info("No existing analysis found. Creating new analysis.")
             return self._get_empty_analysis()
 
+    def _encode_analysis(self, analysis: Dict[str, Any]) -> bytes:
+        """Stamp and serialize an analysis dictionary (caller holds the lock)"""
+        # Update timestamp
+        analysis['last_updated'] = datetime.now().isoformat()
+        if analysis is self.current_analysis:
+            self._prompt_cache = None
+
+        return dumps(analysis, indent=2 if self.pretty_print else None)
+
     def save_analysis(self, analysis: Optional[Dict[str, Any]] = None) -> bool:
         """
-        Save analysis to file
+        Save analysis to file, blocking until it is on disk
 
         Args:
             analysis: Analysis dictionary to save (uses self.current_analysis if None)
@@ -96,32 +149,77 @@ class MarketAnalysisManager:
         Returns:
             True if successful, False otherwise
         """
-        if analysis is None:
-            analysis = self.current_analysis
+        with self._lock:
+            if analysis is None:
+                analysis = self.current_analysis
 
-        try:
-            # Update timestamp
-            analysis['last_updated'] = datetime.now().isoformat()
+            try:
+                # Goes through the writer so it can't be overtaken by an older queued write
+                self._writer.write_now(self.analysis_file, self._encode_analysis(analysis))
 
-            # Write to file
-            with open(self.analysis_file, 'w') as f:
-                json.dump(analysis, f, indent=2)
+                logger.info(f"Analysis saved successfully")
+                return True
 
-            logger.info(f"Analysis saved successfully")
-            return True
+            except Exception as e:
+                logger.error(f"Failed to save analysis: {e}")
+                return False
 
-        except Exception as e:
-            logger.error(f"Failed to save analysis: {e}")
-            return False
+    def _queue_save(self) -> bool:
+        """
+        Snapshot the current analysis and hand it to the background writer
+
+        Returns:
+            True if queued (or saved, when background writes are off)
+        """
+        if not self.background_writes:
+            return self.save_analysis()
+
+        with self._lock:
+            try:
+                self._writer.submit(self.analysis_file, self._encode_analysis(self.current_analysis))
+                return True
+            except Exception as e:
+                logger.error(f"Failed to queue analysis save: {e}")
+                return False
+
+    def dump_pretty(self) -> str:
+        """
+        Render the current analysis state as indented JSON for inspection
+
+        Returns:
+            Pretty-printed JSON string
+        """
+        with self._lock:
+            return dumps(self.current_analysis, indent=2).decode('utf-8')
+
+    def flush(self):
+        """Write any queued analysis update to disk now"""
+        self._writer.flush()
 
     def get_previous_analysis(self) -> Dict[str, Any]:
         """
-        Get the current analysis state
+        Get a copy of the current analysis state that is safe to modify
 
         Returns:
-            Current analysis dictionary
+            Deep copy of the current analysis dictionary
+        """
+        with self._lock:
+            return copy.deepcopy(self.current_analysis)
+
+    def get_previous_analysis_view(self) -> Mapping[str, Any]:
         """
-        return self.current_analysis.copy()
+        Get a read-only view of the current analysis state (no copy)
+
+        Nested values are read-only at every depth (dicts as views, lists as
+        tuples). The view reflects later in-place changes (e.g.
+        mark_trade_executed) but not a replacement of the whole state by
+        update_analysis.
+
+        Returns:
+            Read-only mapping over the current analysis
+        """
+        with self._lock:
+            return _ReadOnlyView(self.current_analysis)
 
     def update_analysis(self, new_analysis: Dict[str, Any]) -> bool:
         """
@@ -134,27 +232,29 @@ class MarketAnalysisManager:
             True if successful, False otherwise
         """
         try:
-            # Increment bars since last update for existing setups
-            if self.current_analysis.get('long_assessment', {}).get('status') != 'none':
-                new_analysis['long_assessment']['setup_age_bars'] = \
-                    self.current_analysis.get('long_assessment', {}).get('setup_age_bars', 0) + 1
+            with self._lock:
+                # Increment bars since last update for existing setups
+                if self.current_analysis.get('long_assessment', {}).get('status') != 'none':
+                    new_analysis['long_assessment']['setup_age_bars'] = \
+                        self.current_analysis.get('long_assessment', {}).get('setup_age_bars', 0) + 1
 
-            if self.current_analysis.get('short_assessment', {}).get('status') != 'none':
-                new_analysis['short_assessment']['setup_age_bars'] = \
-                    self.current_analysis.get('short_assessment', {}).get('setup_age_bars', 0) + 1
+                if self.current_analysis.get('short_assessment', {}).get('status') != 'none':
+                    new_analysis['short_assessment']['setup_age_bars'] = \
+                        self.current_analysis.get('short_assessment', {}).get('setup_age_bars', 0) + 1
 
-            # Increment bars since last trade
-            new_analysis['bars_since_last_trade'] = \
-                self.current_analysis.get('bars_since_last_trade', 0) + 1
+                # Increment bars since last trade
+                new_analysis['bars_since_last_trade'] = \
+                    self.current_analysis.get('bars_since_last_trade', 0) + 1
 
-            # Reset bars since last update
-            new_analysis['bars_since_last_update'] = 0
+                # Reset bars since last update
+                new_analysis['bars_since_last_update'] = 0
 
-            # Update current analysis
-            self.current_analysis = new_analysis
+                # Update current analysis
+                self.current_analysis = new_analysis
+                self._prompt_cache = None
 
-            # Save to file
-            return self.save_analysis()
+            # Save to file without blocking the caller on disk I/O
+            return self._queue_save()
 
         except Exception as e:
             logger.error(f"Failed to update analysis: {e}")
@@ -167,16 +267,20 @@ class MarketAnalysisManager:
         Args:
             direction: "LONG" or "SHORT"
         """
-        self.current_analysis['bars_since_last_trade'] = 0
+        with self._lock:
+            self.current_analysis['bars_since_last_trade'] = 0
+
+            # Reset the executed setup
+            if direction == "LONG":
+                self.current_analysis['long_assessment']['status'] = 'none'
+                self.current_analysis['long_assessment']['setup_age_bars'] = 0
+            elif direction == "SHORT":
+                self.current_analysis['short_assessment']['status'] = 'none'
+                self.current_analysis['short_assessment']['setup_age_bars'] = 0
 
-        # Reset the executed setup
-        if direction == "LONG":
-            self.current_analysis['long_assessment']['status'] = 'none'
-            self.current_analysis['long_assessment']['setup_age_bars'] = 0
-        elif direction == "SHORT":
-            self.current_analysis['short_assessment']['status'] = 'none'
-            self.current_analysis['short_assessment']['setup_age_bars'] = 0
+            self._prompt_cache = None
 
+        # Not queued - a restart must never see the executed setup as still ready
         self.save_analysis()
         logger.info(f"{direction} trade executed - setup reset")
 
@@ -184,9 +288,18 @@ class MarketAnalysisManager:
         """
         Format previous analysis for inclusion in agent prompt
 
+        The text is cached until the analysis is updated, saved or reset.
+
         Returns:
             Formatted string for prompt
         """
+        with self._lock:
+            if self._prompt_cache is None:
+                self._prompt_cache = self._build_prompt()
+            return self._prompt_cache
+
+    def _build_prompt(self) -> str:
+        """Build the previous-analysis prompt text from the current state"""
         analysis = self.current_analysis
 
         lines = []
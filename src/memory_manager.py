@@ -6,54 +6,285 @@ Handles trade history storage and retrieval using file-based system
 
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import os
+import sys
+import threading
+from collections import defaultdict, deque
+from itertools import islice
+from types import MappingProxyType
+from typing import Callable, Deque, Dict, Iterator, List, Mapping, Optional, Any
 from datetime import datetime
 from pathlib import Path
 
+from .json_io import atomic_write, dumps, get_background_writer, load_file, loads
+
 logger = logging.getLogger(__name__)
 
+# Shared read-only default for missing nested trade sections (avoids a new {} per lookup)
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+TradePredicate = Callable[[Dict[str, Any]], bool]
+
+
+def _setup_type_is(value: Any) -> TradePredicate:
+    return lambda trade: trade.get('setup', _EMPTY).get('type') == value
+
+
+def _direction_is(value: Any) -> TradePredicate:
+    return lambda trade: trade.get('setup', _EMPTY).get('direction') == value
+
+
+def _result_is(value: Any) -> TradePredicate:
+    return lambda trade: trade.get('outcome', _EMPTY).get('result') == value
+
+
+def _confidence_at_least(threshold: float) -> TradePredicate:
+    return lambda trade: trade.get('decision', _EMPTY).get('confidence', 0) >= threshold
+
+
+# query_trades filter key -> predicate factory
+FILTER_PREDICATES: Dict[str, Callable[[Any], TradePredicate]] = {
+    'setup_type': _setup_type_is,
+    'direction': _direction_is,
+    'result': _result_is,
+    'min_confidence': _confidence_at_least
+}
+
 
 class MemoryManager:
     """Manages trade history and performance tracking"""
 
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", fsync: bool = False, background_writes: bool = True,
+                 compress: bool = False, max_trades_in_memory: int = 1000, pretty_print: bool = False):
         """
         Initialize Memory Manager
 
         Args:
             data_dir: Directory for storing trade history
+            fsync: Force each appended trade to disk before returning
+            background_writes: Write performance log updates on the shared writer thread (False = write inline)
+            compress: Store the performance log gzip-compressed (performance_log.json.gz)
+            max_trades_in_memory: Most recent trades kept in trade_history (older ones stay in the log)
+            pretty_print: Write the performance log indented (compact by default)
         """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
+        self.fsync = fsync
+        self.pretty_print = pretty_print
 
+        # Trades are appended one JSON object per line; the legacy
+        # single-document file is only read once for migration
+        self.trade_log_file = self.data_dir / "trade_history.jsonl"
         self.trade_history_file = self.data_dir / "trade_history.json"
-        self.performance_log_file = self.data_dir / "performance_log.json"
+        self.performance_log_file = self.data_dir / ("performance_log.json.gz" if compress
+                                                     else "performance_log.json")
+
+        # Most recent trades only; all-time stats come from running totals
+        self.trade_history: Deque[Dict[str, Any]] = deque(maxlen=max_trades_in_memory)
+        self._running = {
+            'total_trades': 0,
+            'wins': 0,
+            'losses': 0,
+            'breakeven': 0,
+            'total_pnl': 0.0,
+            'total_rr': 0.0
+        }
+
+        # Shared copies of repeated reasoning text (bounded by the window size)
+        self._strings: Dict[str, str] = {}
+
+        # Lookup index over trade_history (first occurrence wins, as with a scan)
+        self._trade_index: Dict[str, Dict[str, Any]] = {}
+
+        # Bumped on every history change; derived stats are cached against it
+        self._version = 0
+        self._stats_cache: Dict[str, tuple] = {}
+        self._summary_cache: Optional[tuple] = None
+
+        # Secondary indices for query_trades equality filters, in history order
+        self._by_setup_type: Dict[Any, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._by_direction: Dict[Any, Deque[Dict[str, Any]]] = defaultdict(deque)
+        self._by_result: Dict[Any, Deque[Dict[str, Any]]] = defaultdict(deque)
+
+        # Set when the legacy history could not be migrated - the JSONL log must
+        # not be started without it, so new trades wait here for the retry
+        self._migration_pending = False
+        self._unmigrated_trades: List[Dict[str, Any]] = []
 
         # Load existing history
-        self.trade_history = self._load_trade_history()
+        for trade in self._load_trade_history():
+            self._add_trade(trade)
         self.performance_log = self._load_performance_log()
 
-        logger.info(f"MemoryManager initialized (trades loaded: {len(self.trade_history)})")
+        # Performance log updates are serialized under the lock and written by the background writer
+        self.background_writes = background_writes
+        self._writer = get_background_writer()
+        self._perf_lock = threading.RLock()
 
-    def _load_trade_history(self) -> List[Dict[str, Any]]:
-        """Load trade history from file"""
-        if not self.trade_history_file.exists():
-            return []
+        logger.info(f"MemoryManager initialized (trades loaded: {self._running['total_trades']}, "
+                    f"in memory: {len(self.trade_history)})")
+
+    def _load_trade_history(self) -> Iterator[Dict[str, Any]]:
+        """Stream trade history from the append-only log (migrating legacy JSON once)"""
+        if self.trade_log_file.exists():
+            return self._read_trade_log(repair_torn_line=True)
+
+        if self.trade_history_file.exists():
+            return iter(self._migrate_legacy_history())
+
+        return iter(())
+
+    def iter_trade_log(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every stored trade, oldest first, including trades
+        no longer held in trade_history
+
+        Only one trade is decoded at a time, so memory use does not grow
+        with the size of the log.
+
+        Returns:
+            Iterator of trade dictionaries
+        """
+        if not self.trade_log_file.exists():
+            return iter(())
+        return self._read_trade_log()
+
+    def _read_trade_log(self, repair_torn_line: bool = False) -> Iterator[Dict[str, Any]]:
+        """Read trade log line by line, skipping any torn/corrupt lines"""
+        raw_line = ''
 
         try:
-            with open(self.trade_history_file, 'r') as f:
-                return json.load(f)
+            with open(self.trade_log_file, 'rb') as f:
+                for line_number, raw_line in enumerate(f, 1):
+                    line = raw_line.strip()
+                    if not line:
+                        continue
+                    try:
+                        trade = loads(line)
+                    except ValueError as e:  # Malformed JSON or invalid UTF-8
+                        logger.warning(f"Skipping corrupt trade log line {line_number}: {e}")
+                        continue
+                    yield trade
+
+            # Terminate a torn final line so the next append starts cleanly
+            if repair_torn_line and raw_line and not raw_line.endswith(b"\n"):
+                with open(self.trade_log_file, 'ab') as f:
+                    f.write(b"\n")
         except Exception as e:
             logger.error(f"Error loading trade history: {e}")
+
+    def _migrate_legacy_history(self) -> List[Dict[str, Any]]:
+        """Convert legacy trade_history.json into the JSONL trade log"""
+        try:
+            trades = load_file(self.trade_history_file)
+        except Exception as e:
+            logger.error(f"Error loading legacy trade history: {e}")
             return []
 
-    def _save_trade_history(self):
-        """Save trade history to file"""
+        if self._save_trade_history(trades):
+            logger.info(f"Migrated {len(trades)} trades from {self.trade_history_file.name} "
+                        f"to {self.trade_log_file.name}")
+        else:
+            self._migration_pending = True
+        return trades
+
+    def _save_trade_history(self, trades: List[Dict[str, Any]]) -> bool:
+        """
+        Rewrite the full trade log (migration only - store_trade appends)
+
+        Returns:
+            True if the log was written
+        """
         try:
-            with open(self.trade_history_file, 'w') as f:
-                json.dump(self.trade_history, f, indent=2)
+            atomic_write(self.trade_log_file, b"".join(dumps(trade) + b"\n" for trade in trades))
+            return True
         except Exception as e:
             logger.error(f"Error saving trade history: {e}")
+            return False
+
+    def _append_trade(self, trade_data: Dict[str, Any]):
+        """Append a single trade to the log - O(1) regardless of history size"""
+        if self._migration_pending:
+            # Appending now would start a log without the legacy trades, which the
+            # next load would then prefer - retry the migration with this trade instead
+            self._unmigrated_trades.append(trade_data)
+            try:
+                trades = load_file(self.trade_history_file)
+            except Exception as e:
+                logger.error(f"Error appending trade: legacy history unreadable: {e}")
+                return
+            if self._save_trade_history(trades + self._unmigrated_trades):
+                self._migration_pending = False
+                self._unmigrated_trades = []
+                logger.info(f"Migrated {len(trades)} trades from {self.trade_history_file.name} "
+                            f"to {self.trade_log_file.name}")
+            return
+
+        try:
+            with open(self.trade_log_file, 'ab') as f:
+                f.write(dumps(trade_data) + b"\n")
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        except Exception as e:
+            logger.error(f"Error appending trade: {e}")
+
+    def _add_trade(self, trade: Dict[str, Any]):
+        """Add a trade to the in-memory window, lookup indices and running totals"""
+        self._share_strings(trade)
+
+        if len(self.trade_history) == self.trade_history.maxlen:
+            self._evict_trade(self.trade_history[0])
+        self.trade_history.append(trade)
+
+        if 'trade_id' in trade:
+            self._trade_index.setdefault(trade['trade_id'], trade)
+
+        setup = trade.get('setup', _EMPTY)
+        outcome = trade.get('outcome', _EMPTY)
+        self._by_setup_type[setup.get('type')].append(trade)
+        self._by_direction[setup.get('direction')].append(trade)
+        self._by_result[outcome.get('result')].append(trade)
+
+        result = outcome.get('result', 'UNKNOWN')
+        running = self._running
+        running['total_trades'] += 1
+        if result == 'WIN':
+            running['wins'] += 1
+        elif result == 'LOSS':
+            running['losses'] += 1
+        elif result == 'BREAKEVEN':
+            running['breakeven'] += 1
+        running['total_pnl'] += outcome.get('profit_loss', 0.0)
+        running['total_rr'] += outcome.get('risk_reward_achieved', 0.0)
+
+    def _share_strings(self, trade: Dict[str, Any]):
+        """Intern enum-like fields and dedupe reasoning text so repeats share one object"""
+        for section, field in (('setup', 'type'), ('setup', 'direction'), ('outcome', 'result')):
+            values = trade.get(section)
+            if isinstance(values, dict) and isinstance(values.get(field), str):
+                values[field] = sys.intern(values[field])
+
+        decision = trade.get('decision')
+        if isinstance(decision, dict) and isinstance(decision.get('reasoning'), str):
+            if len(self._strings) >= (self.trade_history.maxlen or 1000):
+                self._strings.clear()
+            reasoning = decision['reasoning']
+            decision['reasoning'] = self._strings.setdefault(reasoning, reasoning)
+
+    def _evict_trade(self, trade: Dict[str, Any]):
+        """Drop the oldest in-memory trade from the lookup indices"""
+        if self._trade_index.get(trade.get('trade_id')) is trade:
+            del self._trade_index[trade['trade_id']]
+
+        setup = trade.get('setup', _EMPTY)
+        for index, key in ((self._by_setup_type, setup.get('type')),
+                           (self._by_direction, setup.get('direction')),
+                           (self._by_result, trade.get('outcome', _EMPTY).get('result'))):
+            indexed = index[key]
+            indexed.popleft()  # Oldest overall is also the oldest in its index
+            if not indexed:
+                del index[key]
 
     def _load_performance_log(self) -> Dict[str, Any]:
         """Load performance log from file"""
@@ -61,17 +292,20 @@ class MemoryManager:
             return {'sessions': [], 'summary': {}}
 
         try:
-            with open(self.performance_log_file, 'r') as f:
-                return json.load(f)
+            return load_file(self.performance_log_file)
         except Exception as e:
             logger.error(f"Error loading performance log: {e}")
             return {'sessions': [], 'summary': {}}
 
     def _save_performance_log(self):
-        """Save performance log to file"""
+        """Save performance log to file (queued on the background writer if enabled)"""
         try:
-            with open(self.performance_log_file, 'w') as f:
-                json.dump(self.performance_log, f, indent=2)
+            with self._perf_lock:
+                content = dumps(self.performance_log, indent=2 if self.pretty_print else None)
+                if self.background_writes:
+                    self._writer.submit(self.performance_log_file, content)
+                else:
+                    self._writer.write_now(self.performance_log_file, content)
         except Exception as e:
             logger.error(f"Error saving performance log: {e}")
 
@@ -85,14 +319,16 @@ class MemoryManager:
         Returns:
             Trade ID
         """
-        trade_id = trade_data.get('trade_id') or f"{datetime.now().isoformat()}"
+        stored_at = datetime.now().isoformat()
+        trade_id = trade_data.get('trade_id') or stored_at
         trade_data['trade_id'] = trade_id
-        trade_data['stored_at'] = datetime.now().isoformat()
+        trade_data['stored_at'] = stored_at
 
-        self.trade_history.append(trade_data)
-        self._save_trade_history()
+        self._add_trade(trade_data)
+        self._version += 1
+        self._append_trade(trade_data)
 
-        logger.info(f"Trade stored: {trade_id} - {trade_data.get('outcome', {}).get('result', 'UNKNOWN')}")
+        logger.info(f"Trade stored: {trade_id} - {trade_data.get('outcome', _EMPTY).get('result', 'UNKNOWN')}")
         return trade_id
 
     def get_trade(self, trade_id: str) -> Optional[Dict[str, Any]]:
@@ -105,10 +341,7 @@ class MemoryManager:
         Returns:
             Trade data or None
         """
-        for trade in self.trade_history:
-            if trade.get('trade_id') == trade_id:
-                return trade
-        return None
+        return self._trade_index.get(trade_id)
 
     def query_trades(self, filters: Dict[str, Any], limit: int = 20) -> List[Dict[str, Any]]:
         """
@@ -121,29 +354,26 @@ class MemoryManager:
         Returns:
             List of matching trades
         """
-        results = []
+        # Narrow to the smallest matching index, then check remaining filters
+        candidates = self.trade_history
+        indexed_key = None
+        for key, index in (('setup_type', self._by_setup_type),
+                           ('direction', self._by_direction),
+                           ('result', self._by_result)):
+            if key in filters:
+                indexed = index.get(filters[key], ())
+                if len(indexed) < len(candidates):
+                    candidates = indexed
+                    indexed_key = key
+
+        # Filter checks are bound once per call, not re-read per trade
+        predicates = [FILTER_PREDICATES[key](value) for key, value in filters.items()
+                      if key in FILTER_PREDICATES and key != indexed_key]
 
-        for trade in reversed(self.trade_history):  # Most recent first
-            match = True
-
-            # Apply filters
-            if 'setup_type' in filters:
-                if trade.get('setup', {}).get('type') != filters['setup_type']:
-                    match = False
-
-            if 'direction' in filters:
-                if trade.get('setup', {}).get('direction') != filters['direction']:
-                    match = False
-
-            if 'result' in filters:
-                if trade.get('outcome', {}).get('result') != filters['result']:
-                    match = False
-
-            if 'min_confidence' in filters:
-                if trade.get('decision', {}).get('confidence', 0) < filters['min_confidence']:
-                    match = False
+        results = []
 
-            if match:
+        for trade in reversed(candidates):  # Most recent first
+            if all(predicate(trade) for predicate in predicates):
                 results.append(trade)
                 if len(results) >= limit:
                     break
@@ -179,7 +409,7 @@ class MemoryManager:
         total_rr = 0.0
 
         for trade in trades:
-            outcome = trade.get('outcome', {})
+            outcome = trade.get('outcome', _EMPTY)
             result = outcome.get('result', 'UNKNOWN')
 
             if result == 'WIN':
@@ -206,30 +436,64 @@ class MemoryManager:
             'avg_pnl': total_pnl / total_trades if total_trades > 0 else 0.0
         }
 
+    def _cached_stats(self, key: str, compute) -> Dict[str, Any]:
+        """Return stats cached for the current history version, computing on a miss"""
+        cached = self._stats_cache.get(key)
+        if cached is None or cached[0] != self._version:
+            cached = (self._version, compute())
+            self._stats_cache[key] = cached
+        return dict(cached[1])
+
+    def _all_time_stats(self) -> Dict[str, Any]:
+        """
+        Statistics over the full trade history, including trades no longer in
+        memory, from the running totals (same shape as calculate_stats)
+
+        Returns:
+            Statistics dictionary
+        """
+        running = self._running
+        total_trades = running['total_trades']
+        wins = running['wins']
+        completed_trades = wins + running['losses']  # Exclude breakeven from win rate calc
+
+        return {
+            'total_trades': total_trades,
+            'wins': wins,
+            'losses': running['losses'],
+            'breakeven': running['breakeven'],
+            'win_rate': wins / completed_trades if completed_trades > 0 else 0.0,
+            'avg_rr': running['total_rr'] / total_trades if total_trades > 0 else 0.0,
+            'total_pnl': running['total_pnl'],
+            'avg_pnl': running['total_pnl'] / total_trades if total_trades > 0 else 0.0
+        }
+
     def get_memory_context(self) -> Dict[str, Any]:
         """
         Generate memory context for Claude analysis
 
+        Stats are recomputed only when a trade has been stored since the last call.
+
         Returns:
             Memory context dictionary with recent performance stats
         """
         # Get recent FVG-only trades
-        fvg_trades = self.query_trades({'setup_type': 'fvg_only'}, limit=20)
-        fvg_stats = self.calculate_stats(fvg_trades)
+        fvg_stats = self._cached_stats('fvg_only', lambda: self.calculate_stats(
+            self.query_trades({'setup_type': 'fvg_only'}, limit=20)))
 
         # Get recent level-only trades
-        level_trades = self.query_trades({'setup_type': 'level_only'}, limit=20)
-        level_stats = self.calculate_stats(level_trades)
+        level_stats = self._cached_stats('level_only', lambda: self.calculate_stats(
+            self.query_trades({'setup_type': 'level_only'}, limit=20)))
 
         # Overall recent performance
-        recent_trades = self.trade_history[-50:] if len(self.trade_history) > 0 else []
-        overall_stats = self.calculate_stats(recent_trades)
+        overall_stats = self._cached_stats('overall_recent', lambda: self.calculate_stats(
+            list(islice(reversed(self.trade_history), 50))))
 
         context = {
             'fvg_only_stats': fvg_stats,
             'level_only_stats': level_stats,
             'overall_recent_stats': overall_stats,
-            'total_trades_all_time': len(self.trade_history),
+            'total_trades_all_time': self._running['total_trades'],
             'last_updated': datetime.now().isoformat()
         }
 
@@ -242,20 +506,46 @@ class MemoryManager:
         Args:
             session_data: Session data dictionary
         """
-        session_data['timestamp'] = datetime.now().isoformat()
-        self.performance_log['sessions'].append(session_data)
-        self._save_performance_log()
+        with self._perf_lock:
+            session_data['timestamp'] = datetime.now().isoformat()
+            self.performance_log['sessions'].append(session_data)
+            self._save_performance_log()
 
         logger.info(f"Session logged: {session_data.get('mode', 'unknown')} mode")
 
     def update_summary(self):
         """Update overall performance summary"""
-        all_stats = self.calculate_stats(self.trade_history)
-        self.performance_log['summary'] = {
-            **all_stats,
-            'last_updated': datetime.now().isoformat()
-        }
-        self._save_performance_log()
+        all_stats = self._all_time_stats()
+        with self._perf_lock:
+            self.performance_log['summary'] = {
+                **all_stats,
+                'last_updated': datetime.now().isoformat()
+            }
+            self._save_performance_log()
+
+    def finalize_session(self, session_data: Dict[str, Any]):
+        """
+        Log a trading session and refresh the summary with a single performance log write
+
+        Args:
+            session_data: Session data dictionary
+        """
+        all_stats = self._all_time_stats()
+        with self._perf_lock:
+            now = datetime.now().isoformat()
+            session_data['timestamp'] = now
+            self.performance_log['sessions'].append(session_data)
+            self.performance_log['summary'] = {
+                **all_stats,
+                'last_updated': now
+            }
+            self._save_performance_log()
+
+        logger.info(f"Session finalized: {session_data.get('mode', 'unknown')} mode")
+
+    def flush(self):
+        """Write any queued performance log update to disk now"""
+        self._writer.flush()
 
     def get_performance_summary(self) -> str:
         """
@@ -264,7 +554,10 @@ class MemoryManager:
         Returns:
             Summary string
         """
-        stats = self.calculate_stats(self.trade_history)
+        if self._summary_cache is not None and self._summary_cache[0] == self._version:
+            return self._summary_cache[1]
+
+        stats = self._all_time_stats()
 
         lines = []
         lines.append("=== OVERALL PERFORMANCE ===")
@@ -286,7 +579,9 @@ class MemoryManager:
             lines.append(f"  Win Rate: {fvg_stats['win_rate']:.1%}")
             lines.append(f"  Avg R/R: {fvg_stats['avg_rr']:.2f}:1")
 
-        return "\n".join(lines)
+        summary = "\n".join(lines)
+        self._summary_cache = (self._version, summary)
+        return summary
 
 
 # Example usage
@@ -4,13 +4,59 @@ Outputs trade signals to CSV for NinjaTrader
 """
 
 import csv
+import io
 import logging
-from typing import Dict, Any
+import mmap
+import os
+from typing import Dict, Any, Optional
 from datetime import datetime
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Decision validation rules - built once at import rather than per signal
+VALID_DECISIONS = frozenset(('LONG', 'SHORT'))
+REQUIRED_FIELDS = ('entry', 'stop', 'target')
+PRICE_TYPES = (int, float)
+TARGET_BUFFER = 5        # Points between raw target and final target
+BUFFER_TOLERANCE = 0.1   # Allowed deviation from the expected buffered target
+MIN_RR = 1.3             # Minimum R:R after the buffer is applied
+
+HEADER_BYTES = b'DateTime,Direction,Entry_Price,Stop_Loss,Target'
+
+
+def _check_geometry(direction: str, entry: float, stop: float,
+                    target: float) -> tuple[Optional[str], float, float, float]:
+    """
+    Check stop/target placement for a trade and measure its risk and reward
+
+    Args:
+        direction: 'LONG' or 'SHORT'
+        entry: Entry price
+        stop: Stop loss price
+        target: Target price
+
+    Returns:
+        Tuple of (error_message or None, risk, reward, rr_ratio)
+    """
+    risk = abs(entry - stop)
+    reward = abs(target - entry)
+    rr_ratio = reward / risk if risk > 0 else 0
+
+    if direction == 'LONG':
+        if stop >= entry:
+            return f"LONG stop ({stop}) must be below entry ({entry})", risk, reward, rr_ratio
+        if target <= entry:
+            return f"LONG target ({target}) must be above entry ({entry})", risk, reward, rr_ratio
+
+    elif direction == 'SHORT':
+        if stop <= entry:
+            return f"SHORT stop ({stop}) must be above entry ({entry})", risk, reward, rr_ratio
+        if target >= entry:
+            return f"SHORT target ({target}) must be below entry ({entry})", risk, reward, rr_ratio
+
+    return None, risk, reward, rr_ratio
+
 
 class SignalGenerator:
     """Generates trade signals in NinjaTrader CSV format"""
@@ -25,17 +71,22 @@ class SignalGenerator:
         self.output_file = Path(output_file)
         self.output_file.parent.mkdir(exist_ok=True)
 
-        # Check if header needs fixing
+        # Check if header needs fixing (one stat covers both existence and size)
         needs_init = False
-        if not self.output_file.exists() or self.output_file.stat().st_size == 0:
+        try:
+            file_size = self.output_file.stat().st_size
+        except FileNotFoundError:
+            file_size = 0
+
+        if file_size == 0:
             needs_init = True
         else:
             # Verify header is correct
             try:
-                with open(self.output_file, 'r') as f:
+                with open(self.output_file, 'rb') as f:
                     header = f.readline().strip()
-                    if header != 'DateTime,Direction,Entry_Price,Stop_Loss,Target':
-                        logger.warning(f"Invalid header detected: {header}")
+                    if header != HEADER_BYTES:
+                        logger.warning(f"Invalid header detected: {header.decode(errors='replace')}")
                         needs_init = True
             except Exception:
                 needs_init = True
@@ -43,6 +94,11 @@ class SignalGenerator:
         if needs_init:
             self._initialize_csv()
 
+        # Today's signal count - backfilled from the file once per day, then
+        # kept current by generate_signal (this class is the only writer)
+        self._today_date: Optional[str] = None
+        self._today_count = 0
+
         logger.info(f"SignalGenerator initialized (output={self.output_file})")
 
     def _initialize_csv(self):
@@ -67,66 +123,49 @@ class SignalGenerator:
             Tuple of (is_valid, error_message)
         """
         # Check decision type
-        if decision.get('decision') not in ['LONG', 'SHORT']:
-            return False, f"Invalid decision type: {decision.get('decision')}"
+        direction = decision.get('decision')
+        if direction not in VALID_DECISIONS:
+            return False, f"Invalid decision type: {direction}"
 
         # Check required fields
-        required_fields = ['entry', 'stop', 'target']
-        for field in required_fields:
+        for field in REQUIRED_FIELDS:
             if field not in decision:
                 return False, f"Missing required field: {field}"
-            if not isinstance(decision[field], (int, float)):
+            if not isinstance(decision[field], PRICE_TYPES):
                 return False, f"Invalid {field} value: {decision[field]}"
 
         # Validate price relationships
-        entry = decision['entry']
-        stop = decision['stop']
         target = decision['target']
-
-        if decision['decision'] == 'LONG':
-            if stop >= entry:
-                return False, f"LONG stop ({stop}) must be below entry ({entry})"
-            if target <= entry:
-                return False, f"LONG target ({target}) must be above entry ({entry})"
-
-        elif decision['decision'] == 'SHORT':
-            if stop <= entry:
-                return False, f"SHORT stop ({stop}) must be above entry ({entry})"
-            if target >= entry:
-                return False, f"SHORT target ({target}) must be below entry ({entry})"
+        error, risk, reward, rr_ratio = _check_geometry(
+            direction, decision['entry'], decision['stop'], target)
+        if error:
+            return False, error
 
         # Validate 5pt buffer was applied correctly (if raw_target exists)
-        if 'raw_target' in decision and decision['raw_target'] is not None:
-            raw_target = decision['raw_target']
-
-            if decision['decision'] == 'LONG':
+        raw_target = decision.get('raw_target')
+        if raw_target is not None:
+            if direction == 'LONG':
                 # LONG: Final target should be 5pts BELOW raw target
-                expected_target = raw_target - 5
-                if abs(target - expected_target) > 0.1:  # Allow 0.1pt tolerance
+                expected_target = raw_target - TARGET_BUFFER
+                if abs(target - expected_target) > BUFFER_TOLERANCE:
                     return False, f"LONG buffer error: target ({target}) should be raw_target - 5 ({expected_target})"
 
-            elif decision['decision'] == 'SHORT':
+            elif direction == 'SHORT':
                 # SHORT: Final target should be 5pts ABOVE raw target
-                expected_target = raw_target + 5
-                if abs(target - expected_target) > 0.1:  # Allow 0.1pt tolerance
+                expected_target = raw_target + TARGET_BUFFER
+                if abs(target - expected_target) > BUFFER_TOLERANCE:
                     return False, f"SHORT buffer error: target ({target}) should be raw_target + 5 ({expected_target})"
 
-        # Calculate and validate R:R ratio with final target (after buffer)
-        risk = abs(entry - stop)
-        reward = abs(target - entry)
-
+        # Validate R:R ratio with final target (after buffer)
         if risk == 0:
             return False, "Risk cannot be zero (entry == stop)"
 
-        rr_ratio = reward / risk
-
         # Minimum R:R requirement: 1.3:1
-        min_rr = 1.3
-        if rr_ratio < min_rr:
-            return False, f"R:R too low: {rr_ratio:.2f}:1 (minimum {min_rr}:1 required after 5pt buffer)"
+        if rr_ratio < MIN_RR:
+            return False, f"R:R too low: {rr_ratio:.2f}:1 (minimum {MIN_RR}:1 required after 5pt buffer)"
 
-        logger.info(f"Validation passed: {decision['decision']} | R:R = {rr_ratio:.2f}:1 | "
-                    f"Risk: {risk:.2f}pts | Reward: {reward:.2f}pts")
+        logger.info("Validation passed: %s | R:R = %.2f:1 | Risk: %.2fpts | Reward: %.2fpts",
+                    direction, rr_ratio, risk, reward)
 
         return True, ""
 
@@ -152,23 +191,21 @@ class SignalGenerator:
             timestamp = datetime.now()
         time_str = timestamp.strftime('%m/%d/%Y %H:%M:%S')
 
-        # Prepare row data
-        row = [
-            time_str,
-            decision['decision'],
-            f"{decision['entry']:.2f}",
-            f"{decision['stop']:.2f}",
-            f"{decision['target']:.2f}"
-        ]
+        # Prepare row - fields are validated numbers/enums that never need quoting,
+        # written with the same \r\n terminator csv.writer uses
+        row = (f"{time_str},{decision['decision']},{decision['entry']:.2f},"
+               f"{decision['stop']:.2f},{decision['target']:.2f}\r\n")
 
         # Append to CSV
         try:
             with open(self.output_file, 'a', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(row)
+                f.write(row)
 
-            logger.info(f"Signal generated: {decision['decision']} @ {decision['entry']:.2f}")
-            logger.info(f"  Stop: {decision['stop']:.2f} | Target: {decision['target']:.2f}")
+            if time_str[:10] == self._today_date:
+                self._today_count += 1
+
+            logger.info("Signal generated: %s @ %.2f", decision['decision'], decision['entry'])
+            logger.info("  Stop: %.2f | Target: %.2f", decision['stop'], decision['target'])
 
             return True
 
@@ -190,9 +227,7 @@ class SignalGenerator:
         stop = decision['stop']
         target = decision['target']
 
-        risk = abs(entry - stop)
-        reward = abs(target - entry)
-        rr_ratio = reward / risk if risk > 0 else 0
+        _, risk, reward, rr_ratio = _check_geometry(decision['decision'], entry, stop, target)
 
         lines = []
         lines.append(f"=== TRADE SIGNAL GENERATED ===")
@@ -236,17 +271,34 @@ class SignalGenerator:
             Number of signals today
         """
         today = datetime.now().strftime('%m/%d/%Y')
+        if today != self._today_date:
+            count = self._scan_signals_for_date(today)
+            if count is None:
+                return 0
+            self._today_date = today
+            self._today_count = count
+
+        return self._today_count
+
+    def _scan_signals_for_date(self, date_str: str) -> Optional[int]:
+        """Count signals in the file for one date (None on read error)"""
+        # Every row starts with its DateTime, so a row for the date is a line
+        # beginning with the date - searched in the raw bytes, no CSV parsing
+        needle = b'\n' + date_str.encode()
         count = 0
 
         try:
-            with open(self.output_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row['DateTime'].startswith(today):
+            with open(self.output_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return 0
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pos = mm.find(needle)
+                    while pos != -1:
                         count += 1
+                        pos = mm.find(needle, pos + len(needle))
         except Exception as e:
             logger.error(f"Error counting signals: {e}")
-            return 0
+            return None
 
         return count
 
@@ -254,28 +306,55 @@ class SignalGenerator:
         """
         Get most recent signals
 
+        Only the tail of the file is read and parsed, so the cost depends on
+        limit rather than on the size of the signal history.
+
         Args:
             limit: Number of signals to retrieve
 
         Returns:
             List of signal dictionaries
         """
-        signals = []
+        if limit <= 0:
+            return self._read_all_signals()
 
         try:
-            with open(self.output_file, 'r') as f:
-                reader = csv.DictReader(f)
-                all_signals = list(reader)
-                signals = all_signals[-limit:] if len(all_signals) > limit else all_signals
+            with open(self.output_file, 'rb') as f:
+                header = f.readline()
+                data_start = f.tell()
+                size = f.seek(0, os.SEEK_END)
+
+                # Grow the tail window until it holds enough complete rows
+                window = limit * 64
+                while True:
+                    start = max(data_start, size - window)
+                    f.seek(start)
+                    tail = f.read(size - start)
+                    if start > data_start:
+                        tail = tail[tail.find(b'\n') + 1:]  # Drop the partial first line
+
+                    text = (header + tail).decode('utf-8')
+                    signals = list(csv.DictReader(io.StringIO(text, newline='')))
+                    if len(signals) >= limit or start == data_start:
+                        return signals[-limit:]
+                    window *= 2
         except Exception as e:
             logger.error(f"Error reading signals: {e}")
             return []
 
-        return signals
+    def _read_all_signals(self) -> list:
+        """Read every signal in the file"""
+        try:
+            with open(self.output_file, 'r') as f:
+                return list(csv.DictReader(f))
+        except Exception as e:
+            logger.error(f"Error reading signals: {e}")
+            return []
 
     def clear_signals(self):
         """Clear all signals (reinitialize CSV)"""
         self._initialize_csv()
+        self._today_date = None
         logger.info("Trade signals cleared")
 
 
@@ -3,16 +3,63 @@ Claude Trading Agent Module
 Main reasoning engine for NQ trading decisions
 """
 
+import copy
+import hashlib
 import json
 import logging
+import re
+from collections import OrderedDict
 from typing import Dict, Optional, Any
 from datetime import datetime
 import os
 import time
 from anthropic import Anthropic, APIError
 
+from .json_io import loads
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of cached Claude verdicts kept per agent
+RESPONSE_CACHE_SIZE = 512
+
+# Quantization steps for the no-trade verdict cache key (values are floored)
+STOCH_STEP = 5       # Stochastic bucket width
+FVG_ZONE_STEP = 5    # FVG zone edge bucket width in points
+FVG_AGE_STEP = 10    # FVG age bucket width in bars
+
+# Appended after the previous analysis state when one is available
+INCREMENTAL_INSTRUCTIONS = """
+CRITICAL INSTRUCTIONS FOR INCREMENTAL ANALYSIS:
+===============================================
+You are NOT doing a fresh analysis. You are UPDATING your previous assessment.
+
+Ask yourself:
+1. What changed with this new bar?
+2. Is my previous setup still valid?
+3. Should I continue waiting or has the setup improved/deteriorated?
+4. Has price moved closer to or further from my planned entry?
+
+If you were waiting for a setup and nothing meaningful changed:
+- Keep the same assessment
+- Increment setup_age_bars
+- Update only what's relevant (e.g., distance to entry)
+
+If you identified no setup previously and still see no setup:
+- It's OKAY to stay in "none" status
+- Explain why you're still waiting
+- Don't force a trade just because time has passed
+
+"""
+
+# Markdown code fences around the JSON response (closing fence optional)
+_JSON_FENCE_RE = re.compile(r'```json\s*(.*?)(?:```|$)', re.DOTALL)
+_FENCE_RE = re.compile(r'```\s*(.*?)(?:```|$)', re.DOTALL)
+_DECODER = json.JSONDecoder()
+
+# Previous-analysis lines that change every bar without changing the question
+# (timestamp and bar counters maintained by MarketAnalysisManager)
+_PER_BAR_LINES_RE = re.compile(r'^\s*(?:Last Updated|Bars Since Last Trade|Setup Age): .*$', re.MULTILINE)
+
 
 class TradingAgent:
     """Claude-powered trading decision engine"""
@@ -42,6 +89,15 @@ class TradingAgent:
         self.stop_loss_max = config.get('risk_management', {}).get('stop_loss_max', 50)
         self.stop_buffer = config.get('risk_management', {}).get('stop_buffer', 5)
 
+        # Static instructions are sent as a cached system prompt on every call
+        self._static_system = self._build_static_system()
+
+        # Verdicts for prompts already answered, keyed by prompt hash (LRU)
+        self._response_cache: OrderedDict = OrderedDict()
+
+        # No-trade verdicts keyed by coarsened market state (LRU)
+        self._none_cache: OrderedDict = OrderedDict()
+
         logger.info(f"TradingAgent initialized (model={self.model}, min_rr={self.min_risk_reward})")
 
     def _find_psychological_levels(self, current_price: float, interval: int = 100) -> Dict[str, float]:
@@ -70,19 +126,158 @@ class TradingAgent:
             'below': level_below
         }
 
-    def query_claude_with_retry(self, prompt: str, max_retries: int = 5) -> Dict[str, Any]:
+    def _prompt_key(self, prompt: str) -> str:
+        """Hash a prompt for the response cache, ignoring per-bar timestamp and counters"""
+        return hashlib.sha256(_PER_BAR_LINES_RE.sub('', prompt).encode()).hexdigest()
+
+    @staticmethod
+    def _fvg_bucket(fvg: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        """Coarsen an FVG to zone edges and an age bucket"""
+        if not fvg:
+            return None
+        return (
+            fvg['bottom'] // FVG_ZONE_STEP,
+            fvg['top'] // FVG_ZONE_STEP,
+            fvg.get('age_bars', 0) // FVG_AGE_STEP
+        )
+
+    @staticmethod
+    def _trend_branch(ema21: float, ema75: float, ema150: float) -> str:
+        """EMA trend label, matching the branches rendered in the prompt"""
+        if ema21 > ema75 > ema150:
+            return 'strong_up'
+        if ema21 < ema75 < ema150:
+            return 'strong_down'
+        if ema21 > ema75:
+            return 'weak_up'
+        if ema21 < ema75:
+            return 'weak_down'
+        return 'neutral'
+
+    @staticmethod
+    def _stoch_zone(stoch: float) -> str:
+        """Stochastic zone, matching the branches rendered in the prompt"""
+        if stoch < 20:
+            return 'oversold'
+        if stoch > 80:
+            return 'overbought'
+        if stoch < 40:
+            return 'below_mid'
+        if stoch > 60:
+            return 'above_mid'
+        return 'neutral'
+
+    def _state_key(
+        self,
+        fvg_context: Dict[str, Any],
+        market_data: Dict[str, Any],
+        previous_analysis: Optional[str] = None,
+        memory_context: Optional[Dict[str, Any]] = None
+    ) -> tuple:
+        """
+        Coarsened market state used to reuse no-trade verdicts
+
+        The key holds every category the prompt switches on (trend branch,
+        price side of EMA21, stochastic zone, FVG presence), so two bars with
+        the same key never get different hints. Price, stochastic, EMA spreads
+        and FVG zones are floored into buckets within those categories. The
+        previous analysis (without per-bar counters) and memory context are
+        hashed in, since the verdict updates that state.
+
+        Args:
+            fvg_context: FVG market context
+            market_data: Market indicators (EMA, Stochastic, etc.)
+            previous_analysis: Previous analysis state (formatted string)
+            memory_context: Past trade performance data
+
+        Returns:
+            Hashable state tuple
+        """
+        current_price = fvg_context['current_price']
+        ema21 = market_data.get('ema21', 0)
+        ema75 = market_data.get('ema75', 0)
+        ema150 = market_data.get('ema150', 0)
+        stoch = market_data.get('stochastic', 50)
+
+        history = _PER_BAR_LINES_RE.sub('', previous_analysis or '') + self._memory_block(memory_context)
+
+        return (
+            self._trend_branch(ema21, ema75, ema150),
+            (current_price > ema21) - (current_price < ema21),  # Drives the EMA_BOUNCE hint
+            self._stoch_zone(stoch),
+            current_price // 1,
+            stoch // STOCH_STEP,
+            (ema21 - ema75) // 1,
+            (ema75 - ema150) // 1,
+            self._fvg_bucket(fvg_context.get('nearest_bullish_fvg')),
+            self._fvg_bucket(fvg_context.get('nearest_bearish_fvg')),
+            hashlib.sha256(history.encode()).hexdigest()
+        )
+
+    def _cache_result(self, cache: OrderedDict, key: Any, result: Dict[str, Any]):
+        """Store a copy of a verdict in an LRU cache, evicting the oldest entry when full"""
+        cache[key] = copy.deepcopy(result)  # Callers update the decision in place
+        cache.move_to_end(key)
+        if len(cache) > RESPONSE_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _cached_result(
+        self,
+        cache: OrderedDict,
+        key: Any,
+        fvg_context: Dict[str, Any],
+        market_data: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a fresh copy of a cached verdict for the current bar, or None
+
+        Args:
+            cache: Verdict cache to look in
+            key: Cache key for the current bar
+            fvg_context: Current FVG market context (replaces the cached bar's)
+            market_data: Current market indicators (replaces the cached bar's)
+
+        Returns:
+            Result dictionary or None on a miss
+        """
+        cached = cache.get(key)
+        if cached is None:
+            return None
+        cache.move_to_end(key)
+
+        result = copy.deepcopy(cached)
+        result['timestamp'] = datetime.now().isoformat()
+        result['fvg_context'] = fvg_context  # Display the current bar, not the cached one
+        result['market_data'] = market_data
+        return result
+
+    def query_claude_with_retry(
+        self,
+        prompt: str,
+        max_retries: int = 5,
+        system: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Query Claude API with exponential backoff retry logic
 
         Args:
             prompt: The prompt to send
             max_retries: Maximum number of retry attempts
+            system: Optional system prompt, marked for prompt caching
 
         Returns:
             API response or raises exception after all retries
         """
         base_delay = 2  # Start with 2 second delay
 
+        extra = {}
+        if system:
+            extra['system'] = [{
+                "type": "text",
+                "text": system,
+                "cache_control": {"type": "ephemeral"}
+            }]
+
         for attempt in range(max_retries):
             try:
                 response = self.client.messages.create(
@@ -92,7 +287,8 @@ class TradingAgent:
                     messages=[{
                         "role": "user",
                         "content": prompt
-                    }]
+                    }],
+                    **extra
                 )
                 return response
 
@@ -131,26 +327,17 @@ class TradingAgent:
         # Should never reach here, but just in case
         raise Exception("Max retries exceeded")
 
-    def build_prompt(
-        self,
-        fvg_context: Dict[str, Any],
-        market_data: Dict[str, Any],
-        memory_context: Optional[Dict[str, Any]] = None,
-        previous_analysis: Optional[str] = None
-    ) -> str:
+    def _build_static_system(self) -> str:
         """
-        Build Claude prompt for trade analysis
+        Build the static system prompt
 
-        Args:
-            fvg_context: FVG market context
-            market_data: Market indicators (EMA, Stochastic, etc.)
-            memory_context: Past trade performance data
-            previous_analysis: Previous analysis state (formatted string)
+        Everything here depends only on the config, so it is built once and
+        sent as a cacheable system block ahead of the per-bar market context.
 
         Returns:
-            Formatted prompt string
+            System prompt string
         """
-        prompt = f"""You are an expert NQ futures trader specializing in price action analysis using Fair Value Gaps, EMAs, and momentum indicators.
+        return f"""You are an expert NQ futures trader specializing in price action analysis using Fair Value Gaps, EMAs, and momentum indicators.
 
 YOUR TRADING PHILOSOPHY:
 ========================
@@ -199,164 +386,6 @@ For ALL trades, apply 5-point buffer to avoid needing perfect precision:
 
 This accounts for spread/slippage and protects against stop-hunting at exact levels.
 
-"""
-
-        # Add previous analysis if available
-        if previous_analysis:
-            prompt += previous_analysis + "\n"
-            prompt += """
-CRITICAL INSTRUCTIONS FOR INCREMENTAL ANALYSIS:
-===============================================
-You are NOT doing a fresh analysis. You are UPDATING your previous assessment.
-
-Ask yourself:
-1. What changed with this new bar?
-2. Is my previous setup still valid?
-3. Should I continue waiting or has the setup improved/deteriorated?
-4. Has price moved closer to or further from my planned entry?
-
-If you were waiting for a setup and nothing meaningful changed:
-- Keep the same assessment
-- Increment setup_age_bars
-- Update only what's relevant (e.g., distance to entry)
-
-If you identified no setup previously and still see no setup:
-- It's OKAY to stay in "none" status
-- Explain why you're still waiting
-- Don't force a trade just because time has passed
-
-"""
-
-        prompt += f"""
-CURRENT MARKET CONTEXT (NEW BAR):
-==================================
-
-Price: {fvg_context['current_price']:.2f}
-
-FAIR VALUE GAPS:
-"""
-
-        # Add bullish FVG info (SHORT opportunity)
-        if fvg_context.get('nearest_bullish_fvg'):
-            fvg = fvg_context['nearest_bullish_fvg']
-            raw_target = fvg['bottom']  # Bottom of gap
-            final_target = raw_target + 5  # Add 5pt buffer for SHORT
-            prompt += f"""
-Nearest Bullish FVG BELOW (SHORT opportunity - FVG_FILL setup):
-  Zone: {fvg['bottom']:.2f} - {fvg['top']:.2f}
-  Size: {fvg['size']:.2f} points
-  Age: {fvg.get('age_bars', 0)} bars
-
-  Raw Target: {raw_target:.2f} (bottom of gap)
-  Final Target: {final_target:.2f} (bottom + 5pt buffer)
-  Distance: {final_target - fvg_context['current_price']:.2f} points
-
-  Setup Idea: Enter SHORT, ride price DOWN to fill gap
-  This gap formed when price jumped UP, leaving unfilled space below.
-"""
-        else:
-            prompt += "\nNo bullish FVGs BELOW current price\n"
-
-        # Add bearish FVG info (LONG opportunity)
-        if fvg_context.get('nearest_bearish_fvg'):
-            fvg = fvg_context['nearest_bearish_fvg']
-            raw_target = fvg['top']  # Top of gap
-            final_target = raw_target - 5  # Subtract 5pt buffer for LONG
-            prompt += f"""
-Nearest Bearish FVG ABOVE (LONG opportunity - FVG_FILL setup):
-  Zone: {fvg['bottom']:.2f} - {fvg['top']:.2f}
-  Size: {fvg['size']:.2f} points
-  Age: {fvg.get('age_bars', 0)} bars
-
-  Raw Target: {raw_target:.2f} (top of gap)
-  Final Target: {final_target:.2f} (top - 5pt buffer)
-  Distance: {final_target - fvg_context['current_price']:.2f} points
-
-  Setup Idea: Enter LONG, ride price UP to fill gap
-  This gap formed when price dropped DOWN, leaving unfilled space above.
-"""
-        else:
-            prompt += "\nNo bearish FVGs ABOVE current price\n"
-
-        # Add EMA trend analysis
-        prompt += f"""
-EMA STRUCTURE & POTENTIAL SETUPS:
-==================================
-Current Price: {fvg_context['current_price']:.2f}
-EMA21:  {market_data.get('ema21', 0):.2f} (distance: {fvg_context['current_price'] - market_data.get('ema21', 0):+.2f})
-EMA75:  {market_data.get('ema75', 0):.2f} (distance: {fvg_context['current_price'] - market_data.get('ema75', 0):+.2f})
-EMA150: {market_data.get('ema150', 0):.2f} (distance: {fvg_context['current_price'] - market_data.get('ema150', 0):+.2f})
-
-Trend & Setup Opportunities:
-"""
-        current_price = fvg_context['current_price']
-        ema21 = market_data.get('ema21', 0)
-        ema75 = market_data.get('ema75', 0)
-        ema150 = market_data.get('ema150', 0)
-
-        if ema21 > ema75 > ema150:
-            prompt += "  Strong UPTREND (EMA21 > EMA75 > EMA150)\n"
-            if current_price > ema21:
-                prompt += f"  EMA_BOUNCE setup: LONG on pullback to EMA21 @ {ema21:.2f}\n"
-        elif ema21 < ema75 < ema150:
-            prompt += "  Strong DOWNTREND (EMA21 < EMA75 < EMA150)\n"
-            if current_price < ema21:
-                prompt += f"  EMA_BOUNCE setup: SHORT on bounce to EMA21 @ {ema21:.2f}\n"
-        elif ema21 > ema75:
-            prompt += "  Weak uptrend (EMA21 > EMA75)\n"
-        elif ema21 < ema75:
-            prompt += "  Weak downtrend (EMA21 < EMA75)\n"
-        else:
-            prompt += "  Neutral/Choppy - Avoid trend trades\n"
-
-        # Add Stochastic momentum with setup ideas
-        stoch = market_data.get('stochastic', 50)
-        prompt += f"""
-MOMENTUM INDICATOR & SETUPS:
-=============================
-Stochastic: {stoch:.2f}
-"""
-        if stoch < 20:
-            prompt += "  OVERSOLD - Potential COUNTER_TREND long (mean reversion)\n"
-        elif stoch > 80:
-            prompt += "  OVERBOUGHT - Potential COUNTER_TREND short (mean reversion)\n"
-        elif stoch < 40:
-            prompt += "  Below midpoint - Can support MOMENTUM long if trending up\n"
-        elif stoch > 60:
-            prompt += "  Above midpoint - Can support MOMENTUM short if trending down\n"
-        else:
-            prompt += "  Neutral zone\n"
-
-        # Add psychological level analysis
-        nearest_levels = self._find_psychological_levels(current_price)
-        prompt += f"""
-PSYCHOLOGICAL LEVELS (EMS):
-============================
-Current Price: {current_price:.2f}
-Nearest Level Above: {nearest_levels['above']} ({nearest_levels['above'] - current_price:+.2f}pts)
-Nearest Level Below: {nearest_levels['below']} ({nearest_levels['below'] - current_price:+.2f}pts)
-
-LEVEL_TRADE opportunities:
-  - Break above {nearest_levels['above']} with retest (LONG continuation)
-  - Rejection at {nearest_levels['above']} (SHORT reversal)
-  - Break below {nearest_levels['below']} with retest (SHORT continuation)
-  - Bounce at {nearest_levels['below']} (LONG reversal)
-"""
-
-        # Add memory context if available
-        if memory_context:
-            prompt += f"""
-HISTORICAL PERFORMANCE:
-"""
-            if memory_context.get('fvg_only_stats'):
-                stats = memory_context['fvg_only_stats']
-                prompt += f"""
-FVG-Only Trades: {stats['total_trades']} trades, {stats['win_rate']*100:.1f}% win rate
-Average R/R: {stats['avg_rr']:.2f}:1
-"""
-
-        # Add decision criteria
-        prompt += f"""
 DECISION CRITERIA:
 ==================
 - Minimum Risk/Reward: {self.min_risk_reward}:1
@@ -460,7 +489,188 @@ but your PRIMARY analysis should be in long_assessment and short_assessment.
 Only set primary_decision to LONG/SHORT if the corresponding assessment status is "ready".
 """
 
-        return prompt
+    def build_prompt(
+        self,
+        fvg_context: Dict[str, Any],
+        market_data: Dict[str, Any],
+        memory_context: Optional[Dict[str, Any]] = None,
+        previous_analysis: Optional[str] = None
+    ) -> str:
+        """
+        Build the per-bar Claude prompt for trade analysis
+
+        Static instructions live in the system prompt (_build_static_system);
+        this covers only the previous analysis and current market context.
+
+        Args:
+            fvg_context: FVG market context
+            market_data: Market indicators (EMA, Stochastic, etc.)
+            memory_context: Past trade performance data
+            previous_analysis: Previous analysis state (formatted string)
+
+        Returns:
+            Formatted prompt string
+        """
+        previous_block = f"{previous_analysis}\n{INCREMENTAL_INSTRUCTIONS}" if previous_analysis else ""
+
+        return (f"{previous_block}{self._render_context(fvg_context, market_data)}"
+                f"{self._memory_block(memory_context)}")
+
+    def _render_context(self, fvg_context: Dict[str, Any], market_data: Dict[str, Any]) -> str:
+        """
+        Render the current market context section of the prompt
+
+        Args:
+            fvg_context: FVG market context
+            market_data: Market indicators (EMA, Stochastic, etc.)
+
+        Returns:
+            Market context text
+        """
+        parts = []
+        parts.append(f"""
+CURRENT MARKET CONTEXT (NEW BAR):
+==================================
+
+Price: {fvg_context['current_price']:.2f}
+
+FAIR VALUE GAPS:
+""")
+
+        # Add bullish FVG info (SHORT opportunity)
+        if fvg_context.get('nearest_bullish_fvg'):
+            fvg = fvg_context['nearest_bullish_fvg']
+            raw_target = fvg['bottom']  # Bottom of gap
+            final_target = raw_target + 5  # Add 5pt buffer for SHORT
+            parts.append(f"""
+Nearest Bullish FVG BELOW (SHORT opportunity - FVG_FILL setup):
+  Zone: {fvg['bottom']:.2f} - {fvg['top']:.2f}
+  Size: {fvg['size']:.2f} points
+  Age: {fvg.get('age_bars', 0)} bars
+
+  Raw Target: {raw_target:.2f} (bottom of gap)
+  Final Target: {final_target:.2f} (bottom + 5pt buffer)
+  Distance: {final_target - fvg_context['current_price']:.2f} points
+
+  Setup Idea: Enter SHORT, ride price DOWN to fill gap
+  This gap formed when price jumped UP, leaving unfilled space below.
+""")
+        else:
+            parts.append("\nNo bullish FVGs BELOW current price\n")
+
+        # Add bearish FVG info (LONG opportunity)
+        if fvg_context.get('nearest_bearish_fvg'):
+            fvg = fvg_context['nearest_bearish_fvg']
+            raw_target = fvg['top']  # Top of gap
+            final_target = raw_target - 5  # Subtract 5pt buffer for LONG
+            parts.append(f"""
+Nearest Bearish FVG ABOVE (LONG opportunity - FVG_FILL setup):
+  Zone: {fvg['bottom']:.2f} - {fvg['top']:.2f}
+  Size: {fvg['size']:.2f} points
+  Age: {fvg.get('age_bars', 0)} bars
+
+  Raw Target: {raw_target:.2f} (top of gap)
+  Final Target: {final_target:.2f} (top - 5pt buffer)
+  Distance: {final_target - fvg_context['current_price']:.2f} points
+
+  Setup Idea: Enter LONG, ride price UP to fill gap
+  This gap formed when price dropped DOWN, leaving unfilled space above.
+""")
+        else:
+            parts.append("\nNo bearish FVGs ABOVE current price\n")
+
+        # Add EMA trend analysis
+        parts.append(f"""
+EMA STRUCTURE & POTENTIAL SETUPS:
+==================================
+Current Price: {fvg_context['current_price']:.2f}
+EMA21:  {market_data.get('ema21', 0):.2f} (distance: {fvg_context['current_price'] - market_data.get('ema21', 0):+.2f})
+EMA75:  {market_data.get('ema75', 0):.2f} (distance: {fvg_context['current_price'] - market_data.get('ema75', 0):+.2f})
+EMA150: {market_data.get('ema150', 0):.2f} (distance: {fvg_context['current_price'] - market_data.get('ema150', 0):+.2f})
+
+Trend & Setup Opportunities:
+""")
+        current_price = fvg_context['current_price']
+        ema21 = market_data.get('ema21', 0)
+        ema75 = market_data.get('ema75', 0)
+        ema150 = market_data.get('ema150', 0)
+
+        if ema21 > ema75 > ema150:
+            parts.append("  Strong UPTREND (EMA21 > EMA75 > EMA150)\n")
+            if current_price > ema21:
+                parts.append(f"  EMA_BOUNCE setup: LONG on pullback to EMA21 @ {ema21:.2f}\n")
+        elif ema21 < ema75 < ema150:
+            parts.append("  Strong DOWNTREND (EMA21 < EMA75 < EMA150)\n")
+            if current_price < ema21:
+                parts.append(f"  EMA_BOUNCE setup: SHORT on bounce to EMA21 @ {ema21:.2f}\n")
+        elif ema21 > ema75:
+            parts.append("  Weak uptrend (EMA21 > EMA75)\n")
+        elif ema21 < ema75:
+            parts.append("  Weak downtrend (EMA21 < EMA75)\n")
+        else:
+            parts.append("  Neutral/Choppy - Avoid trend trades\n")
+
+        # Add Stochastic momentum with setup ideas
+        stoch = market_data.get('stochastic', 50)
+        parts.append(f"""
+MOMENTUM INDICATOR & SETUPS:
+=============================
+Stochastic: {stoch:.2f}
+""")
+        if stoch < 20:
+            parts.append("  OVERSOLD - Potential COUNTER_TREND long (mean reversion)\n")
+        elif stoch > 80:
+            parts.append("  OVERBOUGHT - Potential COUNTER_TREND short (mean reversion)\n")
+        elif stoch < 40:
+            parts.append("  Below midpoint - Can support MOMENTUM long if trending up\n")
+        elif stoch > 60:
+            parts.append("  Above midpoint - Can support MOMENTUM short if trending down\n")
+        else:
+            parts.append("  Neutral zone\n")
+
+        # Add psychological level analysis
+        nearest_levels = self._find_psychological_levels(current_price)
+        parts.append(f"""
+PSYCHOLOGICAL LEVELS (EMS):
+============================
+Current Price: {current_price:.2f}
+Nearest Level Above: {nearest_levels['above']} ({nearest_levels['above'] - current_price:+.2f}pts)
+Nearest Level Below: {nearest_levels['below']} ({nearest_levels['below'] - current_price:+.2f}pts)
+
+LEVEL_TRADE opportunities:
+  - Break above {nearest_levels['above']} with retest (LONG continuation)
+  - Rejection at {nearest_levels['above']} (SHORT reversal)
+  - Break below {nearest_levels['below']} with retest (SHORT continuation)
+  - Bounce at {nearest_levels['below']} (LONG reversal)
+""")
+
+        return "".join(parts)
+
+    def _memory_block(self, memory_context: Optional[Dict[str, Any]]) -> str:
+        """
+        Render the historical performance section of the prompt
+
+        Args:
+            memory_context: Past trade performance data
+
+        Returns:
+            Historical performance text (empty without memory context)
+        """
+        if not memory_context:
+            return ""
+
+        parts = []
+        parts.append("""
+HISTORICAL PERFORMANCE:
+""")
+        if memory_context.get('fvg_only_stats'):
+            stats = memory_context['fvg_only_stats']
+            parts.append(f"""
+FVG-Only Trades: {stats['total_trades']} trades, {stats['win_rate']*100:.1f}% win rate
+Average R/R: {stats['avg_rr']:.2f}:1
+""")
+
+        return "".join(parts)
 
     def parse_claude_response(self, response_text: str) -> Optional[Dict[str, Any]]:
         """
@@ -474,13 +684,17 @@ Only set primary_decision to LONG/SHORT if the corresponding assessment status i
         """
         try:
             # Extract JSON from response (handle markdown code blocks)
-            text = response_text.strip()
-            if '```json' in text:
-                text = text.split('```json')[1].split('```')[0].strip()
-            elif '```' in text:
-                text = text.split('```')[1].split('```')[0].strip()
+            match = _JSON_FENCE_RE.search(response_text) or _FENCE_RE.search(response_text)
+            text = match.group(1) if match else response_text
 
-            decision = json.loads(text)
+            # Decode the JSON object (orjson when available), falling back to
+            # raw_decode when prose after the object contains braces
+            start = max(text.find('{'), 0)
+            end = text.rfind('}') + 1
+            try:
+                decision = loads(text[start:end])
+            except ValueError:
+                decision, _ = _DECODER.raw_decode(text, start)
 
             # AUTO-CONVERT: If agent returned new format but not old format, convert automatically
             if 'long_assessment' in decision and 'short_assessment' in decision:
@@ -620,6 +834,20 @@ Only set primary_decision to LONG/SHORT if the corresponding assessment status i
         # Build prompt
         prompt = self.build_prompt(fvg_context, market_data, memory_context, previous_analysis)
 
+        # Identical context already answered - reuse the verdict
+        prompt_key = self._prompt_key(prompt)
+        cached = self._cached_result(self._response_cache, prompt_key, fvg_context, market_data)
+        if cached is not None:
+            logger.info("Context unchanged since a previous bar - reusing cached verdict")
+            return cached
+
+        # Near-identical market already judged not tradeable - reuse the verdict
+        state_key = self._state_key(fvg_context, market_data, previous_analysis, memory_context)
+        cached = self._cached_result(self._none_cache, state_key, fvg_context, market_data)
+        if cached is not None:
+            logger.info("Market state unchanged since a no-trade bar - reusing cached verdict")
+            return cached
+
         try:
             # Show full prompt
             logger.info("="*60)
@@ -629,36 +857,10 @@ Only set primary_decision to LONG/SHORT if the corresponding assessment status i
             logger.info("="*60)
 
             # Show waiting message
-            print("\nWaiting for Agent response", end='', flush=True)
-
-            import threading
-            import time
-
-            # Animation flag
-            waiting = True
-
-            def animate_dots():
-                while waiting:
-                    for i in range(6):
-                        if not waiting:
-                            break
-                        print('.', end='', flush=True)
-                        time.sleep(0.5)
-                    if waiting:
-                        print('\r' + ' ' * 40 + '\r', end='', flush=True)
-                        print("Waiting for Agent response", end='', flush=True)
-
-            # Start animation in background
-            anim_thread = threading.Thread(target=animate_dots, daemon=True)
-            anim_thread.start()
+            print("\nWaiting for Agent response...", flush=True)
 
             # Query Claude with retry logic
-            response = self.query_claude_with_retry(prompt, max_retries=5)
-
-            # Stop animation
-            waiting = False
-            time.sleep(0.1)  # Let animation thread finish
-            print('\r' + ' ' * 40 + '\r', end='', flush=True)  # Clear line
+            response = self.query_claude_with_retry(prompt, max_retries=5, system=self._static_system)
 
             # Extract response text
             response_text = response.content[0].text
@@ -670,9 +872,6 @@ Only set primary_decision to LONG/SHORT if the corresponding assessment status i
             logger.info(response_text)
             logger.info("="*60)
 
-            # Wait 1 second before continuing
-            time.sleep(1)
-
             # Parse response
             decision = self.parse_claude_response(response_text)
 
@@ -711,6 +910,12 @@ Only set primary_decision to LONG/SHORT if the corresponding assessment status i
             else:
                 logger.warning(f"VALIDATION FAILED: {error_msg}")
 
+            if is_valid:
+                self._cache_result(self._response_cache, prompt_key, result)
+                # Only no-trade verdicts are reused across similar bars
+                if decision.get('primary_decision') == 'NONE':
+                    self._cache_result(self._none_cache, state_key, result)
+
             return result
 
         except Exception as e:
@@ -0,0 +1,83 @@
+"""
+Test script for Level Detector
+Verifies nearby level ordering against the original scan-and-sort logic
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.level_detector import LevelDetector
+
+
+def reference_nearby_levels(detector, current_price, interval, count):
+    """Original loop-based implementation of find_nearby_levels"""
+    nearest = detector.round_to_level(current_price, interval)
+    levels = []
+
+    for i in range(count):
+        if nearest + (i * interval) >= current_price:
+            levels.append(nearest + (i * interval))
+
+    for i in range(1, count + 1):
+        if nearest - (i * interval) <= current_price:
+            levels.append(nearest - (i * interval))
+
+    levels.sort(key=lambda x: abs(x - current_price))
+    return levels
+
+
+def test_nearby_levels_match_reference():
+    """Vectorized nearby levels must match the original ordering exactly"""
+    print("=" * 60)
+    print("TEST: Nearby Levels Match Reference")
+    print("=" * 60)
+
+    detector = LevelDetector()
+    prices = [14685.50, 14700.00, 14650.00, 14750.00, 14649.75, 25173.25, 99.5, 0.0]
+
+    for interval in (100, 1000):
+        for count in (0, 1, 3, 5):
+            for price in prices:
+                expected = reference_nearby_levels(detector, price, interval, count)
+                actual = detector.find_nearby_levels(price, interval, count)
+                assert actual == expected, f"{price}/{interval}/{count}: {actual} != {expected}"
+                assert all(type(level) is int for level in actual)
+
+    print("[OK] Nearby levels match reference for all prices")
+
+
+def test_level_context():
+    """Level context exposes nearest levels and nearby EMS levels"""
+    detector = LevelDetector()
+    context = detector.analyze_level_context(14685.50, {}, interval=100)
+
+    assert context['nearest_level_above'] == 14700
+    assert context['nearest_level_below'] == 14600
+    assert context['on_level'] is False
+    assert context['nearby_levels'][:2] == [14700, 14600]
+
+    print(detector.get_level_summary(context))
+
+
+def test_level_context_independent():
+    """Repeated prices return independent contexts"""
+    detector = LevelDetector()
+
+    first = detector.analyze_level_context(14685.50, {}, interval=100)
+    first['nearby_levels'].append(-1)
+    second = detector.analyze_level_context(14685.50, {}, interval=100)
+    other = detector.analyze_level_context(14685.50, {}, interval=1000)
+
+    assert -1 not in second['nearby_levels']
+    assert second['nearest_level_above'] == 14700
+    assert other['nearest_level_above'] == 15000
+
+    print("[OK] Level contexts do not share mutable state")
+
+
+if __name__ == "__main__":
+    test_nearby_levels_match_reference()
+    test_level_context()
+    test_level_context_independent()
+    print("\nALL TESTS COMPLETED")
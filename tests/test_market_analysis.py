@@ -4,6 +4,7 @@ Verifies the persistence and incremental update functionality
 """
 
 import sys
+import tempfile
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -202,6 +203,79 @@ def test_waiting_patience():
     print("✓ Agent successfully waited patiently without forcing trades")
 
 
+def test_prompt_cache_invalidation():
+    """Cached prompt text is rebuilt after updates and trade execution"""
+    print("\n" + "=" * 60)
+    print("TEST 4: Prompt Cache")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MarketAnalysisManager(f"{data_dir}/analysis.json", background_writes=False)
+
+        first = manager.format_previous_analysis_for_prompt()
+        assert manager.format_previous_analysis_for_prompt() is first
+
+        manager.update_analysis({
+            'overall_bias': 'bearish',
+            'waiting_for': 'Retest of 14700 FVG',
+            'long_assessment': {'status': 'none', 'reasoning': 'No setup'},
+            'short_assessment': {'status': 'ready', 'entry_plan': 14700.0, 'stop_plan': 14720.0,
+                                 'target_plan': 14640.0, 'confidence': 0.7, 'reasoning': 'Test'}
+        })
+        updated = manager.format_previous_analysis_for_prompt()
+        assert "Overall Bias: BEARISH" in updated
+        assert "Status: READY" in updated
+
+        manager.mark_trade_executed("SHORT")
+        assert "Status: READY" not in manager.format_previous_analysis_for_prompt()
+
+    print("[OK] Prompt cache invalidated on state changes")
+
+
+def test_previous_analysis_isolation():
+    """Copies don't leak changes back and views can't be modified"""
+    print("\n" + "=" * 60)
+    print("TEST 5: Previous Analysis Copy/View")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MarketAnalysisManager(f"{data_dir}/analysis.json", background_writes=False)
+
+        analysis_copy = manager.get_previous_analysis()
+        analysis_copy['long_assessment']['status'] = 'ready'
+        assert manager.current_analysis['long_assessment']['status'] == 'none'
+
+        view = manager.get_previous_analysis_view()
+        try:
+            view['long_assessment']['status'] = 'ready'
+            assert False, "view should be read-only"
+        except TypeError:
+            pass
+        assert view['long_assessment']['status'] == 'none'
+
+        # Read-only at every depth
+        manager.current_analysis['long_assessment']['target_fvg'] = {'bottom': 14600, 'levels': [{'price': 14600}]}
+        target_fvg = view['long_assessment']['target_fvg']
+        for mutate in (
+            lambda: target_fvg.__setitem__('bottom', 999),
+            lambda: target_fvg['levels'].append({}),
+            lambda: target_fvg['levels'][0].__setitem__('price', 999),
+        ):
+            try:
+                mutate()
+                assert False, "nested view should be read-only"
+            except (TypeError, AttributeError):
+                pass
+        assert manager.current_analysis['long_assessment']['target_fvg'] == \
+            {'bottom': 14600, 'levels': [{'price': 14600}]}
+
+        # View stays live for in-place changes
+        manager.mark_trade_executed('LONG')
+        assert view['bars_since_last_trade'] == 0
+
+    print("[OK] Copy is independent and view is read-only")
+
+
 if __name__ == "__main__":
     print("\nMARKET ANALYSIS MANAGER TEST SUITE")
     print("=" * 60)
@@ -210,6 +284,8 @@ if __name__ == "__main__":
     test_basic_operations()
     test_incremental_updates()
     test_waiting_patience()
+    test_prompt_cache_invalidation()
+    test_previous_analysis_isolation()
 
     print("\n" + "=" * 60)
     print("ALL TESTS COMPLETED")
@@ -0,0 +1,338 @@
+"""
+Test script for Memory Manager
+Verifies append-only trade persistence and reload behaviour
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import json_io
+from src import memory_manager
+from src.memory_manager import MemoryManager
+
+
+def make_trade(trade_id, result='WIN', setup_type='fvg_only', direction='SHORT', pnl=10.0):
+    """Build a sample trade record"""
+    return {
+        'trade_id': trade_id,
+        'setup': {'type': setup_type, 'direction': direction},
+        'outcome': {'result': result, 'profit_loss': pnl, 'risk_reward_achieved': 2.0},
+        'decision': {'confidence': 0.7, 'reasoning': 'FVG setup near EMS level'}
+    }
+
+
+def test_append_and_reload():
+    """Trades are appended one per line and survive a reload"""
+    print("=" * 60)
+    print("TEST: Append-Only Trade Log")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MemoryManager(data_dir)
+        manager.store_trade(make_trade('t1'))
+        manager.store_trade(make_trade('t2', result='LOSS', pnl=-5.0))
+
+        log_file = Path(data_dir) / "trade_history.jsonl"
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])['trade_id'] == 't2'
+        assert manager.get_trade('t2')['outcome']['result'] == 'LOSS'
+        assert manager.get_trade('missing') is None
+
+        reloaded = MemoryManager(data_dir)
+        assert [t['trade_id'] for t in reloaded.trade_history] == ['t1', 't2']
+        assert reloaded.get_trade('t1')['trade_id'] == 't1'
+
+    print("[OK] Trades appended and reloaded")
+
+
+def test_legacy_migration():
+    """A legacy trade_history.json is converted to the JSONL log once"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        legacy_file = Path(data_dir) / "trade_history.json"
+        legacy_file.write_text(json.dumps([make_trade('old1'), make_trade('old2')], indent=2))
+
+        manager = MemoryManager(data_dir)
+        assert [t['trade_id'] for t in manager.trade_history] == ['old1', 'old2']
+        assert (Path(data_dir) / "trade_history.jsonl").exists()
+
+        manager.store_trade(make_trade('new1'))
+        reloaded = MemoryManager(data_dir)
+        assert [t['trade_id'] for t in reloaded.trade_history] == ['old1', 'old2', 'new1']
+
+    print("[OK] Legacy history migrated")
+
+
+def test_failed_migration_keeps_legacy_history():
+    """A failed migration never leaves a JSONL log that hides the legacy trades"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        legacy_file = Path(data_dir) / "trade_history.json"
+        log_file = Path(data_dir) / "trade_history.jsonl"
+        legacy_file.write_text(json.dumps([make_trade('old1'), make_trade('old2')], indent=2))
+
+        saved_write = memory_manager.atomic_write
+
+        def failing_write(path, data):
+            raise OSError("disk full")
+
+        memory_manager.atomic_write = failing_write
+        try:
+            manager = MemoryManager(data_dir)
+            assert [t['trade_id'] for t in manager.trade_history] == ['old1', 'old2']
+            manager.store_trade(make_trade('new1'))
+            assert not log_file.exists()
+        finally:
+            memory_manager.atomic_write = saved_write
+
+        # Write works again - the next trade completes the migration
+        manager.store_trade(make_trade('new2'))
+        assert log_file.exists()
+        manager.store_trade(make_trade('new3'))
+        reloaded = MemoryManager(data_dir)
+        assert [t['trade_id'] for t in reloaded.trade_history] == ['old1', 'old2', 'new1', 'new2', 'new3']
+
+    print("[OK] Failed migration keeps legacy history")
+
+
+def test_torn_line_skipped():
+    """A partially written final line does not discard the rest of the log"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MemoryManager(data_dir)
+        manager.store_trade(make_trade('t1'))
+
+        with open(Path(data_dir) / "trade_history.jsonl", 'a') as f:
+            f.write('{"trade_id": "t2", "outc')
+
+        reloaded = MemoryManager(data_dir)
+        assert [t['trade_id'] for t in reloaded.trade_history] == ['t1']
+
+        reloaded.store_trade(make_trade('t3'))
+        assert [t['trade_id'] for t in MemoryManager(data_dir).trade_history] == ['t1', 't3']
+
+    print("[OK] Torn line skipped")
+
+
+def test_invalid_utf8_line_skipped():
+    """A non-UTF-8 line is skipped without dropping later trades (both decoders)"""
+    saved_orjson = json_io.orjson
+    try:
+        for decoder in (saved_orjson, None):
+            json_io.orjson = decoder
+            with tempfile.TemporaryDirectory() as data_dir:
+                with open(Path(data_dir) / "trade_history.jsonl", 'wb') as f:
+                    f.write(b'{"trade_id": "a"}\n')
+                    f.write(b'{"trade_id": "b", "reasoning": "FVG \x97 EMA"}\n')
+                    f.write(b'{"trade_id": "c"}\n')
+
+                manager = MemoryManager(data_dir)
+                assert [t['trade_id'] for t in manager.trade_history] == ['a', 'c'], decoder
+    finally:
+        json_io.orjson = saved_orjson
+
+    print("[OK] Invalid UTF-8 line skipped")
+
+
+def test_performance_log_background_write():
+    """Queued performance log updates reach disk by flush, latest state last"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MemoryManager(data_dir)
+        log_file = Path(data_dir) / "performance_log.json"
+
+        manager.log_session({'session': 1})
+        manager.log_session({'session': 2})
+        manager.flush()
+        assert len(json.loads(log_file.read_text())['sessions']) == 2
+
+    print("[OK] Performance log written in background")
+
+
+def matches_filters(trade, filters):
+    """Reference filter check - one full scan per query"""
+    setup = trade.get('setup', {})
+    return (setup.get('type') == filters.get('setup_type', setup.get('type'))
+            and setup.get('direction') == filters.get('direction', setup.get('direction'))
+            and trade['outcome'].get('result') == filters.get('result', trade['outcome'].get('result'))
+            and trade['decision'].get('confidence', 0) >= filters.get('min_confidence', 0))
+
+
+def test_query_trades_indexed():
+    """Indexed queries return the same most-recent-first results as a scan"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MemoryManager(data_dir)
+        for i in range(30):
+            manager.store_trade(make_trade(
+                f't{i}',
+                result='WIN' if i % 3 else 'LOSS',
+                setup_type='fvg_only' if i % 2 else 'level_only',
+                direction='LONG' if i % 5 else 'SHORT'
+            ))
+
+        queries = [
+            {'setup_type': 'fvg_only'},
+            {'setup_type': 'level_only', 'result': 'LOSS'},
+            {'direction': 'SHORT', 'result': 'WIN'},
+            {'setup_type': 'fvg_and_level'},
+            {'min_confidence': 0.5},
+            {'setup_type': 'fvg_only', 'min_confidence': 0.8},
+            {}
+        ]
+        for filters in queries:
+            expected = [t for t in reversed(manager.trade_history)
+                        if matches_filters(t, filters)][:5]
+            assert manager.query_trades(filters, limit=5) == expected, filters
+
+    print("[OK] Indexed queries match scan")
+
+
+def test_memory_context_cached():
+    """Memory context stats are reused until a new trade is stored"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MemoryManager(data_dir)
+        manager.store_trade(make_trade('t1'))
+
+        first = manager.get_memory_context()
+        first['fvg_only_stats']['wins'] = 99  # Callers get copies, not the cache
+        assert manager.get_memory_context()['fvg_only_stats']['wins'] == 1
+
+        summary = manager.get_performance_summary()
+        assert manager.get_performance_summary() is summary
+
+        manager.store_trade(make_trade('t2', result='LOSS', pnl=-5.0))
+        assert "Total Trades: 2" in manager.get_performance_summary()
+        context = manager.get_memory_context()
+        assert context['fvg_only_stats']['total_trades'] == 2
+        assert context['overall_recent_stats']['losses'] == 1
+        assert context['total_trades_all_time'] == 2
+
+    print("[OK] Memory context cached by history version")
+
+
+def test_bounded_history_running_stats():
+    """Only recent trades stay in memory while all-time stats cover every trade"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MemoryManager(data_dir, max_trades_in_memory=100)
+        results = ['WIN', 'LOSS', 'BREAKEVEN', 'UNKNOWN']
+        all_trades = []
+        for i in range(150):
+            trade = make_trade(f't{i}', result=results[i % 4], pnl=(i % 7) - 3.5,
+                               setup_type='fvg_only' if i % 2 else 'level_only')
+            manager.store_trade(trade)
+            all_trades.append(trade)
+
+        assert len(manager.trade_history) == 100
+        assert manager.get_trade('t0') is None
+        assert manager.get_trade('t149')['trade_id'] == 't149'
+        assert len(manager.query_trades({'setup_type': 'fvg_only'}, limit=1000)) == 50
+        assert manager._all_time_stats() == manager.calculate_stats(all_trades)
+
+        context = manager.get_memory_context()
+        assert context['total_trades_all_time'] == 150
+        assert context['overall_recent_stats'] == manager.calculate_stats(all_trades[-50:])
+
+        reloaded = MemoryManager(data_dir, max_trades_in_memory=100)
+        assert reloaded._all_time_stats() == manager._all_time_stats()
+        assert [t['trade_id'] for t in reloaded.iter_trade_log()] == [f't{i}' for i in range(150)]
+        assert [t['trade_id'] for t in reloaded.trade_history] == [f't{i}' for i in range(50, 150)]
+
+    print("[OK] Bounded history with running stats")
+
+
+def test_compressed_performance_log():
+    """Compressed performance log round-trips through gzip"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MemoryManager(data_dir, background_writes=False, compress=True)
+        manager.log_session({'session': 1})
+
+        log_file = Path(data_dir) / "performance_log.json.gz"
+        assert log_file.read_bytes()[:2] == b'\x1f\x8b'
+        assert MemoryManager(data_dir, compress=True).performance_log['sessions'][0]['session'] == 1
+
+    print("[OK] Compressed performance log")
+
+
+def test_repeated_strings_shared():
+    """Trades loaded with identical text share one string object"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MemoryManager(data_dir)
+        manager.store_trade(make_trade('t1'))
+        manager.store_trade(make_trade('t2'))
+
+        reloaded = MemoryManager(data_dir)
+        first, second = reloaded.trade_history
+        assert first['decision']['reasoning'] is second['decision']['reasoning']
+        assert first['setup']['type'] is second['setup']['type']
+
+    print("[OK] Repeated strings shared")
+
+
+def test_finalize_session():
+    """Session and summary are recorded together"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MemoryManager(data_dir, background_writes=False)
+        manager.store_trade(make_trade('t1'))
+        manager.finalize_session({'mode': 'live'})
+
+        log = json.loads((Path(data_dir) / "performance_log.json").read_text())
+        assert log['sessions'][0]['mode'] == 'live'
+        assert log['summary']['total_trades'] == 1
+        assert log['summary']['last_updated'] == log['sessions'][0]['timestamp']
+
+    print("[OK] Session finalized")
+
+
+def test_non_ascii_text_written_as_utf8():
+    """Reasoning with non-ASCII characters survives a reload on any platform"""
+    reasoning = 'Sweep of 14700 → fill of bullish FVG — EMA21 holds'
+    with tempfile.TemporaryDirectory() as data_dir:
+        manager = MemoryManager(data_dir, background_writes=False)
+        trade = make_trade('t1')
+        trade['decision']['reasoning'] = reasoning
+        manager.store_trade(trade)
+        manager.log_session({'mode': 'live', 'notes': reasoning})
+
+        # Files are UTF-8 regardless of the locale's default encoding
+        raw = (Path(data_dir) / "trade_history.jsonl").read_bytes()
+        assert reasoning in raw.decode('utf-8')
+        (Path(data_dir) / "performance_log.json").read_bytes().decode('utf-8')
+
+        reloaded = MemoryManager(data_dir)
+        assert reloaded.get_trade('t1')['decision']['reasoning'] == reasoning
+        assert reloaded.performance_log['sessions'][0]['notes'] == reasoning
+
+    print("[OK] Non-ASCII text written as UTF-8")
+
+
+def test_legacy_nan_performance_log():
+    """A performance log the stdlib wrote with NaN still loads"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        log_file = Path(data_dir) / "performance_log.json"
+        log_file.write_text(json.dumps({'sessions': [{'mode': 'backtest', 'sharpe': float('nan')}],
+                                        'summary': {'total_trades': 7, 'profit_factor': float('inf')}}))
+
+        manager = MemoryManager(data_dir)
+        assert manager.performance_log['summary']['total_trades'] == 7
+        assert manager.performance_log['summary']['profit_factor'] == float('inf')
+        assert len(manager.performance_log['sessions']) == 1
+
+    print("[OK] Legacy NaN performance log loaded")
+
+
+if __name__ == "__main__":
+    test_append_and_reload()
+    test_legacy_migration()
+    test_failed_migration_keeps_legacy_history()
+    test_torn_line_skipped()
+    test_invalid_utf8_line_skipped()
+    test_performance_log_background_write()
+    test_query_trades_indexed()
+    test_memory_context_cached()
+    test_bounded_history_running_stats()
+    test_compressed_performance_log()
+    test_repeated_strings_shared()
+    test_finalize_session()
+    test_non_ascii_text_written_as_utf8()
+    test_legacy_nan_performance_log()
+    print("\nALL TESTS COMPLETED")
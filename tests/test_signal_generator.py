@@ -0,0 +1,119 @@
+"""
+Test script for Signal Generator
+Verifies the NinjaTrader CSV output format and signal bookkeeping
+"""
+
+import csv
+import io
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.signal_generator import SignalGenerator
+
+
+SHORT_DECISION = {'decision': 'SHORT', 'entry': 14712.0, 'stop': 14730.0, 'target': 14650.0}
+LONG_DECISION = {'decision': 'LONG', 'entry': 14600.25, 'stop': 14580.0, 'target': 14660.5}
+
+
+def test_signal_row_format():
+    """Signal rows are byte-identical to csv.writer output"""
+    print("=" * 60)
+    print("TEST: Signal Row Format")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        generator = SignalGenerator(f"{data_dir}/trade_signals.csv")
+        timestamp = datetime(2025, 11, 25, 14, 30, 0)
+
+        assert generator.generate_signal(SHORT_DECISION, timestamp)
+        assert generator.generate_signal(LONG_DECISION, timestamp)
+
+        expected = io.StringIO(newline='')
+        writer = csv.writer(expected)
+        writer.writerow(['DateTime', 'Direction', 'Entry_Price', 'Stop_Loss', 'Target'])
+        for d in (SHORT_DECISION, LONG_DECISION):
+            writer.writerow(['11/25/2025 14:30:00', d['decision'],
+                             f"{d['entry']:.2f}", f"{d['stop']:.2f}", f"{d['target']:.2f}"])
+
+        content = Path(f"{data_dir}/trade_signals.csv").read_bytes()
+        assert content == expected.getvalue().encode()
+
+    print("[OK] Signal rows match csv.writer output")
+
+
+def test_count_signals_today():
+    """Today's count is backfilled from the file and kept current afterwards"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        output_file = f"{data_dir}/trade_signals.csv"
+        generator = SignalGenerator(output_file)
+        generator.generate_signal(SHORT_DECISION)
+        generator.generate_signal(LONG_DECISION, datetime(2020, 1, 2, 9, 0, 0))
+
+        # Fresh instance backfills from the file
+        generator = SignalGenerator(output_file)
+        assert generator.count_signals_today() == 1
+
+        generator.generate_signal(LONG_DECISION)
+        generator.generate_signal(SHORT_DECISION, datetime(2020, 1, 2, 10, 0, 0))
+        assert generator.count_signals_today() == 2
+
+        generator.clear_signals()
+        assert generator.count_signals_today() == 0
+
+    print("[OK] Today's signal count tracked")
+
+
+def test_recent_signals_tail():
+    """Tail read returns the same rows as parsing the whole file"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        output_file = f"{data_dir}/trade_signals.csv"
+        generator = SignalGenerator(output_file)
+        assert generator.get_recent_signals() == []
+
+        for minute in range(50):
+            decision = dict(SHORT_DECISION, target=14650.0 - minute / 4)
+            generator.generate_signal(decision, datetime(2025, 11, 25, 14, minute, 0))
+
+        with open(output_file, 'r') as f:
+            all_signals = list(csv.DictReader(f))
+
+        for limit in (1, 3, 10, 49, 50, 200):
+            assert generator.get_recent_signals(limit) == all_signals[-limit:], limit
+        assert generator.get_recent_signals(10)[-1]['Target'] == '14637.75'
+
+    print("[OK] Recent signals read from file tail")
+
+
+def test_signal_summary_geometry():
+    """Summary reflects the decision's current prices"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        generator = SignalGenerator(f"{data_dir}/trade_signals.csv")
+
+        decision = dict(SHORT_DECISION)
+        assert generator.validate_decision(decision) == (True, "")
+        summary = generator.get_signal_summary(decision)
+        assert "(18.00pts risk)" in summary
+        assert "Risk/Reward: 3.44:1" in summary
+
+        # Prices edited after validation are not reported stale
+        decision['stop'] = 14724.0
+        summary = generator.get_signal_summary(decision)
+        assert "(12.00pts risk)" in summary
+        assert "Risk/Reward: 5.17:1" in summary
+
+        bad = dict(LONG_DECISION, stop=14610.0)
+        assert generator.validate_decision(bad) == (
+            False, "LONG stop (14610.0) must be below entry (14600.25)")
+
+    print("[OK] Signal summary geometry")
+
+
+if __name__ == "__main__":
+    test_signal_row_format()
+    test_count_signals_today()
+    test_recent_signals_tail()
+    test_signal_summary_geometry()
+    print("\nALL TESTS COMPLETED")
@@ -0,0 +1,235 @@
+"""
+Test script for Trading Agent
+Verifies prompt construction and the request sent to Claude (no network calls)
+"""
+
+import copy
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.trading_agent import TradingAgent
+
+
+CONFIG = {
+    'trading_params': {'min_risk_reward': 3.0, 'confidence_threshold': 0.65},
+    'risk_management': {'stop_loss_min': 15, 'stop_loss_default': 20, 'stop_loss_max': 50, 'stop_buffer': 5}
+}
+
+FVG_CONTEXT = {
+    'current_price': 14685.50,
+    'nearest_bullish_fvg': {'top': 14660, 'bottom': 14655, 'size': 5.0, 'distance': -25.5, 'age_bars': 12},
+    'nearest_bearish_fvg': None
+}
+
+MARKET_DATA = {'ema21': 14680.0, 'ema75': 14670.0, 'ema150': 14650.0, 'stochastic': 55.0}
+
+
+NONE_RESPONSE = """{
+    "overall_bias": "neutral",
+    "waiting_for": "No quality setup",
+    "long_assessment": {"status": "none", "confidence": 0.0, "reasoning": "No setup"},
+    "short_assessment": {"status": "none", "confidence": 0.0, "reasoning": "No setup"},
+    "primary_decision": "NONE"
+}"""
+
+LONG_RESPONSE = """{
+    "overall_bias": "bullish",
+    "waiting_for": "In trade",
+    "long_assessment": {"status": "ready", "setup_type": "EMA_BOUNCE", "entry_plan": 14685.0,
+                        "stop_plan": 14660.0, "raw_target": 14765.0, "target_plan": 14760.0,
+                        "risk_reward": 3.0, "confidence": 0.8, "reasoning": "Pullback to EMA21"},
+    "short_assessment": {"status": "none", "confidence": 0.0, "reasoning": "No setup"},
+    "primary_decision": "LONG"
+}"""
+
+
+
+class FakeMessages:
+    """Records messages.create calls instead of hitting the API"""
+
+    def __init__(self, text='{}'):
+        self.calls = []
+        self.text = text
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)])
+
+
+def make_agent(text='{}'):
+    """Create an agent whose client records requests"""
+    agent = TradingAgent(CONFIG, api_key='test-key')
+    agent.client = SimpleNamespace(messages=FakeMessages(text))
+    return agent
+
+
+def test_static_system_prompt():
+    """Config-only instructions go in a cached system block"""
+    agent = make_agent()
+
+    prompt = agent.build_prompt(FVG_CONTEXT, MARKET_DATA)
+    assert "CURRENT MARKET CONTEXT" in prompt
+    assert "14685.50" in prompt
+    assert "YOUR TRADING PHILOSOPHY" not in prompt
+    assert "Respond in JSON format" not in prompt
+
+    assert "YOUR TRADING PHILOSOPHY" in agent._static_system
+    assert "Minimum Risk/Reward: 3.0:1" in agent._static_system
+    assert '"primary_decision": "LONG" | "SHORT" | "NONE"' in agent._static_system
+
+    agent.query_claude_with_retry(prompt, system=agent._static_system)
+    call = agent.client.messages.calls[-1]
+    assert call['system'] == [{
+        "type": "text",
+        "text": agent._static_system,
+        "cache_control": {"type": "ephemeral"}
+    }]
+    assert call['messages'] == [{"role": "user", "content": prompt}]
+
+    # No system prompt given - request is unchanged
+    agent.query_claude_with_retry(prompt)
+    assert 'system' not in agent.client.messages.calls[-1]
+
+    print("[OK] Static system prompt cached")
+
+
+def test_identical_context_cached():
+    """A repeated context reuses the verdict without another API call"""
+    agent = make_agent(NONE_RESPONSE)
+    calls = agent.client.messages.calls
+
+    previous = ("PREVIOUS ANALYSIS STATE:\nLast Updated: 2025-11-25T14:00:00\n"
+                "Bars Since Last Trade: 3\nOverall Bias: NEUTRAL\n\n"
+                "LONG ASSESSMENT:\n  Status: WAITING\n  Setup Age: 2 bars\n")
+    first = agent.analyze_setup(FVG_CONTEXT, MARKET_DATA, previous_analysis=previous)
+    assert first['success'] and len(calls) == 1
+    expected = copy.deepcopy(first['decision'])
+
+    # Caller updates the verdict in place (as MarketAnalysisManager does)
+    first['decision']['long_assessment']['setup_age_bars'] = 1
+    first['decision']['long_assessment']['status'] = 'waiting'
+
+    # Only the timestamp and bar counters moved
+    previous = (previous.replace("14:00:00", "14:05:00")
+                .replace("Last Trade: 3", "Last Trade: 4").replace("Age: 2 bars", "Age: 3 bars"))
+    second = agent.analyze_setup(FVG_CONTEXT, MARKET_DATA, previous_analysis=previous)
+    assert len(calls) == 1
+    assert second['decision'] == expected
+    assert second['decision'] is not first['decision']
+
+    # Price moved - asks again
+    moved = dict(FVG_CONTEXT, current_price=14690.25)
+    agent.analyze_setup(moved, MARKET_DATA, previous_analysis=previous)
+    assert len(calls) == 2
+
+    print("[OK] Identical context served from cache")
+
+
+def test_similar_no_trade_state_cached():
+    """Near-duplicate bars reuse a NONE verdict, but never a trade verdict"""
+    agent = make_agent(NONE_RESPONSE)
+    calls = agent.client.messages.calls
+
+    agent.analyze_setup(FVG_CONTEXT, MARKET_DATA)
+    assert len(calls) == 1
+
+    # Sub-point price move and small stochastic change land in the same bucket
+    nudged_fvg = dict(FVG_CONTEXT, current_price=14685.75)
+    nudged_market = dict(MARKET_DATA, stochastic=56.0)
+    result = agent.analyze_setup(nudged_fvg, nudged_market)
+    assert len(calls) == 1
+    assert result['decision']['primary_decision'] == 'NONE'
+    assert result['fvg_context'] is nudged_fvg
+    assert result['market_data'] is nudged_market
+
+    # Whole EMA stack shifts above price - same spreads, but EMA21 side flips
+    shifted = {key: value + 6.0 if key.startswith('ema') else value for key, value in MARKET_DATA.items()}
+    agent.analyze_setup(FVG_CONTEXT, shifted)
+    assert len(calls) == 2
+
+    # Stochastic moves to another bucket - asks again
+    agent.analyze_setup(nudged_fvg, dict(MARKET_DATA, stochastic=70.0))
+    assert len(calls) == 3
+
+    # Trade verdicts are not reused for similar bars
+    agent = make_agent(LONG_RESPONSE)
+    assert agent.analyze_setup(FVG_CONTEXT, MARKET_DATA)['success']
+    assert agent.analyze_setup(nudged_fvg, nudged_market)['success']
+    assert len(agent.client.messages.calls) == 2
+
+    # Previous analysis changed (a setup is now being tracked) - asks again
+    previous = "PREVIOUS ANALYSIS STATE:\nSHORT ASSESSMENT:\n  Status: WAITING\n  Entry Plan: 14686.00"
+    agent = make_agent(NONE_RESPONSE)
+    agent.analyze_setup(FVG_CONTEXT, MARKET_DATA)
+    agent.analyze_setup(FVG_CONTEXT, MARKET_DATA, previous_analysis=previous)
+    agent.analyze_setup(FVG_CONTEXT, MARKET_DATA, previous_analysis=previous.replace("14686", "14690"))
+    assert len(agent.client.messages.calls) == 3
+
+    print("[OK] Similar no-trade state served from cache")
+
+
+def test_state_key_thresholds():
+    """Bars on either side of a prompt threshold never share a cache key"""
+    agent = make_agent()
+
+    def key(price=14685.5, stoch=55.0, ema21=14680.0, ema75=14670.0, ema150=14650.0):
+        market = {'ema21': ema21, 'ema75': ema75, 'ema150': ema150, 'stochastic': stoch}
+        return agent._state_key(dict(FVG_CONTEXT, current_price=price), market)
+
+    # Stochastic zone boundaries (OVERSOLD / below midpoint / neutral / above midpoint / OVERBOUGHT)
+    for below, above in ((19.9, 20.0), (39.9, 40.0), (60.0, 60.1), (80.0, 80.1)):
+        assert key(stoch=below) != key(stoch=above), (below, above)
+
+    # Price side of EMA21 flips with identical spreads (EMA_BOUNCE hint)
+    assert key(ema21=14685.25, ema75=14675.25, ema150=14655.25) != \
+        key(ema21=14685.75, ema75=14675.75, ema150=14655.75)
+
+    # Trend branch flips on a sub-point EMA spread change
+    assert key(ema21=14670.5) != key(ema21=14670.0)        # Strong UPTREND vs Neutral
+    assert key(ema21=14670.25) != key(ema21=14669.75)      # Strong UPTREND vs Weak downtrend
+
+    # Small moves inside every bucket keep the key
+    assert key() == key(price=14685.75, stoch=56.0, ema21=14680.25)
+
+    print("[OK] State key separates prompt thresholds")
+
+
+def test_parse_claude_response():
+    """JSON is extracted from fences and surrounding prose"""
+    agent = make_agent()
+    payload = '{"primary_decision": "NONE", "long_setup": {}, "short_setup": {}, "overall_reasoning": "Wait"}'
+
+    for text in (
+        payload,
+        f"  {payload}\n",
+        f"```json\n{payload}\n```",
+        f"Here is my analysis:\n```json\n{payload}\n```\nLet me know.",
+        f"```\n{payload}\n```",
+        f"```json\n{payload}",
+        f"{payload}\n\nThe market is quiet.",
+        f"{payload}\n\nWaiting for {{FVG}} fill.",
+    ):
+        decision = agent.parse_claude_response(text)
+        assert decision is not None, text
+        assert decision['overall_reasoning'] == "Wait"
+
+    assert agent.parse_claude_response("No JSON here") is None
+    assert agent.parse_claude_response('```json\n{"truncated": \n```') is None
+
+    # New assessment format is converted for backward compatibility
+    decision = agent.parse_claude_response(f"```json\n{NONE_RESPONSE}\n```")
+    assert decision['primary_decision'] == 'NONE'
+    assert decision['overall_reasoning'] == "No quality setup"
+    assert 'long_setup' in decision and 'short_setup' in decision
+
+    print("[OK] Claude response parsing")
+
+
+if __name__ == "__main__":
+    test_static_system_prompt()
+    test_identical_context_cached()
+    test_similar_no_trade_state_cached()
+    test_state_key_thresholds()
+    test_parse_claude_response()